@@ -9,10 +9,14 @@ import json
 import base64
 import sys
 import asyncio
-import requests
 from dotenv import load_dotenv
-from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions, tool, create_sdk_mcp_server
 from functools import partial
+from typing import TYPE_CHECKING
+
+# The Agent SDK is slow to import, so it is loaded where it's first used
+# (ConfluenceAgentChatbot.__init__ / create_session) rather than at module import.
+if TYPE_CHECKING:
+    from claude_agent_sdk import ClaudeSDKClient
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -22,7 +26,28 @@ from scripts.active_projects_tools import (
     get_active_projects_tool_definitions,
     get_active_projects_tool_handlers,
 )
-from scripts.system_prompts import build_scalable_system_prompt, LEGACY_SYSTEM_PROMPT
+from scripts.metrics import metrics, start_http_server, start_json_exporter
+from scripts.tracing import tracer
+from scripts.transport import (
+    DEFAULT_CASSETTE_PATH,
+    Transport,
+    TransportResponse,
+    configure_transport_from_env,
+    get_default_transport,
+)
+from scripts.query_scope import QUERY_ARG, scope_query
+from scripts.tcm_store import tcm_store, DEFAULT_DUMP_PATH
+from scripts.tcm_tools import get_tcm_tool_definitions, get_tcm_tool_handlers
+from scripts.tool_selection import ToolSelector
+from scripts.metadata_warmer import (
+    DEFAULT_MAX_TABLES,
+    DEFAULT_WARM_CONCURRENCY,
+    METADATA_TOOLS,
+    MetadataWarmer,
+)
+from scripts.project_sources import sources_from_env
+from scripts.prompt_manager import DEFAULT_PROMPT_TOKEN_BUDGET, PromptManager
+from scripts.system_prompts import LEGACY_SYSTEM_PROMPT
 
 load_dotenv()
 
@@ -30,54 +55,73 @@ load_dotenv()
 class MCPClient:
     """Client for interacting with CData Connect AI MCP server over HTTP."""
     
-    def __init__(self, server_url: str, email: str = None, access_token: str = None):
+    def __init__(
+        self,
+        server_url: str,
+        email: str = None,
+        access_token: str = None,
+        transport: Transport = None,
+    ):
         self.server_url = server_url.rstrip('/')
-        self.session = requests.Session()
+        # Live HTTP by default; record/replay transports plug in here
+        self.transport = transport or get_default_transport()
         
         # Set default headers for MCP JSON-RPC
-        self.session.headers.update({
+        self.headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json, text/event-stream',
             'User-Agent': f'CDataConnectAI-ClaudeAgent (Python/{sys.version_info.major}.{sys.version_info.minor})',
-        })
+        }
         
         if email and access_token:
             # Basic authentication: email:personal_access_token
             credentials = f"{email}:{access_token}"
             encoded_credentials = base64.b64encode(credentials.encode()).decode()
-            self.session.headers.update({
-                'Authorization': f'Basic {encoded_credentials}'
-            })
+            self.headers['Authorization'] = f'Basic {encoded_credentials}'
     
     def _parse_sse_response(self, response_text: str) -> dict:
         """Parse Server-Sent Events (SSE) response."""
-        for line in response_text.split('\n'):
-            if line.startswith('data: '):
-                return json.loads(line[6:])
+        with tracer.span("cdata sse parse", cat="http", bytes=len(response_text)):
+            for line in response_text.split('\n'):
+                if line.startswith('data: '):
+                    return json.loads(line[6:])
         raise ValueError("No data found in SSE response")
     
+    def _record_bytes(self, response: TransportResponse) -> None:
+        """Record request/response payload sizes for the CData upstream."""
+        metrics.inc("upstream_request_bytes_total", len(response.request.body or b""), upstream="cdata")
+        metrics.inc("upstream_response_bytes_total", len(response.content), upstream="cdata")
+    
     def list_tools(self) -> list:
         """Get available tools from the MCP server."""
-        response = self.session.post(
-            self.server_url,
-            json={"jsonrpc": "2.0", "method": "tools/list", "params": {}, "id": 1}
-        )
-        response.raise_for_status()
+        with metrics.timed("upstream", upstream="cdata", operation="tools/list"), \
+                tracer.span("cdata http tools/list", cat="http"):
+            response = self.transport.post(
+                self.server_url,
+                headers=self.headers,
+                json={"jsonrpc": "2.0", "method": "tools/list", "params": {}, "id": 1}
+            )
+            response.raise_for_status()
+        self._record_bytes(response)
         result = self._parse_sse_response(response.text)
         return result.get("result", {}).get("tools", [])
     
     def call_tool(self, tool_name: str, arguments: dict) -> dict:
         """Call a tool on the MCP server."""
-        response = self.session.post(
-            self.server_url,
-            json={
-                "jsonrpc": "2.0",
-                "method": "tools/call",
-                "params": {"name": tool_name, "arguments": arguments},
-                "id": 2
-            }
-        )
-        response.raise_for_status()
+        with metrics.timed("upstream", upstream="cdata", operation="tools/call"), \
+                tracer.span("cdata http tools/call", cat="http", tool=tool_name):
+            response = self.transport.post(
+                self.server_url,
+                headers=self.headers,
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "tools/call",
+                    "params": {"name": tool_name, "arguments": arguments},
+                    "id": 2
+                }
+            )
+            response.raise_for_status()
+        self._record_bytes(response)
         result = self._parse_sse_response(response.text)
         return result.get("result", {})
 
@@ -88,8 +132,24 @@ class ConfluenceAgentChatbot:
     Integrates active projects filtering from TSG Capacity Management Tool.
     """
     
-    def __init__(self, mcp_server_url: str, email: str = None, access_token: str = None):
-        self.mcp_client = MCPClient(mcp_server_url, email, access_token)
+    def __init__(
+        self,
+        mcp_server_url: str,
+        email: str = None,
+        access_token: str = None,
+        scope_pushdown: bool = False,
+        transport: Transport = None,
+        dynamic_tools: bool = False,
+        prompt_manager: PromptManager = None,
+    ):
+        self.mcp_client = MCPClient(mcp_server_url, email, access_token, transport)
+        
+        # Rewrite queryData SQL so CData only returns active-project rows
+        # (applied only while the active projects cache is loaded)
+        self.scope_pushdown = scope_pushdown
+        
+        # Builds the system prompt from the current active projects snapshot
+        self.prompt_manager = prompt_manager
         
         # Load available tools from MCP server (CData)
         print("Connecting to CData Connect AI MCP server...")
@@ -100,6 +160,10 @@ class ConfluenceAgentChatbot:
         self.active_projects_tool_defs = get_active_projects_tool_definitions()
         self.active_projects_handlers = get_active_projects_tool_handlers()
         
+        # Get TCM store tool definitions (offline analytics over the TCM dump)
+        self.tcm_tool_defs = get_tcm_tool_definitions()
+        self.tcm_handlers = get_tcm_tool_handlers()
+        
         # Show available tools
         print("\nAvailable tools:")
         print("  [CData Connect AI]")
@@ -112,30 +176,98 @@ class ConfluenceAgentChatbot:
         for tool_def in self.active_projects_tool_defs:
             print(f"    - {tool_def.get('name')}")
         
-        # Create Agent SDK tool wrappers (CData + Active Projects)
-        self.agent_tools = self._create_agent_tools()
+        print("  [TCM Store (offline)]")
+        for tool_def in self.tcm_tool_defs:
+            print(f"    - {tool_def.get('name')}")
         
-        # Create MCP server for Agent SDK
-        self.mcp_server = create_sdk_mcp_server(
-            name="cdata_connect",
-            tools=self.agent_tools
-        )
+        # Tool name -> handler for every tool, exposed or not
+        self.tool_handlers = {}
+        for tool_info in self.mcp_tools_list:
+            self.tool_handlers[tool_info.get("name")] = self._cdata_tool_handler
+        for tool_def in self.active_projects_tool_defs:
+            self.tool_handlers[tool_def.get("name")] = self._active_projects_tool_handler
+        for tool_def in self.tcm_tool_defs:
+            self.tool_handlers[tool_def.get("name")] = self._tcm_tool_handler
+        
+        # With dynamic tools, start with a compact core set and add the rest on demand
+        self.tool_selector = None
+        if dynamic_tools:
+            self.tool_selector = ToolSelector(
+                self.mcp_tools_list, self.active_projects_tool_defs + self.tcm_tool_defs
+            )
+        
+        # Optional background metadata prefetch (see start_metadata_warmer)
+        self.metadata_warmer = None
+        
+        # Conversation state needed to resume the session with a different tool set
+        # or prompt; system_prompt is an explicit override of the PromptManager
+        self.system_prompt = None
+        self.session_prompt = None
+        self.session_id = None
+        
+        # Create Agent SDK tool wrappers and the MCP server for Agent SDK
+        self._build_mcp_server()
     
     async def _cdata_tool_handler(self, tool_name: str, args: dict) -> dict:
         """Call a CData MCP tool and return results."""
-        result = self.mcp_client.call_tool(tool_name, args)
+        sql = args.get(QUERY_ARG)
+        if self.scope_pushdown and tool_name == "queryData" and isinstance(sql, str) \
+                and active_projects_cache.is_loaded():
+            scoped_sql, table, value_count = scope_query(
+                sql, active_projects_cache.get_keys(), active_projects_cache.get_names()
+            )
+            if table:
+                # The full SQL can carry up to MAX_PREDICATE_VALUES names - keep it out of the terminal
+                print(f"  [scope] Filtered {table} to {value_count} active projects")
+                metrics.inc("query_scope_rewrites_total", table=table)
+                tracer.instant("query scoped", "tool", table=table, values=value_count)
+                args = {**args, QUERY_ARG: scoped_sql}
+        with metrics.timed("tool", tool=tool_name, source="cdata"):
+            if self.metadata_warmer and tool_name in METADATA_TOOLS:
+                result = await self.metadata_warmer.call(tool_name, args)
+            else:
+                # Run the blocking HTTP call off the event loop so concurrent tool calls overlap
+                result = await asyncio.to_thread(self.mcp_client.call_tool, tool_name, args)
+            text = json.dumps(result, indent=2)
+        if result.get("isError"):
+            metrics.inc("tool_errors_total", tool=tool_name, source="cdata")
+        metrics.inc("tool_response_bytes_total", len(text), tool=tool_name, source="cdata")
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps(result, indent=2)
+                "text": text
             }]
         }
     
+    def start_metadata_warmer(self, **kwargs) -> MetadataWarmer:
+        """
+        Start prefetching catalog/schema/table/column metadata in the background.
+        Metadata tool calls are answered from the warmer's store from then on.
+        kwargs are passed to MetadataWarmer (concurrency, max_tables, catalogs).
+        """
+        self.metadata_warmer = MetadataWarmer(self.mcp_client.call_tool, **kwargs)
+        self.metadata_warmer.start()
+        return self.metadata_warmer
+    
     async def _active_projects_tool_handler(self, tool_name: str, args: dict) -> dict:
         """Call an active projects tool and return results."""
         handler = self.active_projects_handlers.get(tool_name)
         if handler:
-            return await handler(args)
+            with metrics.timed("tool", tool=tool_name, source="active_projects"):
+                return await handler(args)
+        return {
+            "content": [{
+                "type": "text",
+                "text": f"Unknown tool: {tool_name}"
+            }]
+        }
+    
+    async def _tcm_tool_handler(self, tool_name: str, args: dict) -> dict:
+        """Call a TCM store tool and return results."""
+        handler = self.tcm_handlers.get(tool_name)
+        if handler:
+            with metrics.timed("tool", tool=tool_name, source="tcm_store"):
+                return await handler(args)
         return {
             "content": [{
                 "type": "text",
@@ -143,26 +275,23 @@ class ConfluenceAgentChatbot:
             }]
         }
     
+    async def _traced_tool_call(self, handler, tool_name: str, args: dict) -> dict:
+        """Run a tool handler inside a trace span."""
+        with tracer.span(f"tool {tool_name}", cat="tool", input=args):
+            return await handler(tool_name, args)
+    
+    def _exposed_tool_defs(self) -> list[dict]:
+        """Tool definitions to register with the Agent SDK (all of them unless dynamic tools are on)."""
+        if self.tool_selector:
+            return self.tool_selector.exposed_defs()
+        return self.mcp_tools_list + self.active_projects_tool_defs + self.tcm_tool_defs
+    
     def _create_agent_tools(self) -> list:
-        """Create Agent SDK tool wrappers for all tools (CData + Active Projects)."""
-        agent_tools = []
-        
-        # Wrap CData MCP tools
-        for tool_info in self.mcp_tools_list:
-            tool_name = tool_info.get("name")
-            tool_description = tool_info.get("description", "")
-            tool_schema = tool_info.get("inputSchema", {})
-            
-            agent_tool = tool(
-                name=tool_name,
-                description=tool_description,
-                input_schema=tool_schema
-            )(partial(self._cdata_tool_handler, tool_name))
-            
-            agent_tools.append(agent_tool)
+        """Create Agent SDK tool wrappers for the exposed tools (CData + Active Projects + TCM Store)."""
+        from claude_agent_sdk import tool
         
-        # Wrap Active Projects tools
-        for tool_def in self.active_projects_tool_defs:
+        agent_tools = []
+        for tool_def in self._exposed_tool_defs():
             tool_name = tool_def.get("name")
             tool_description = tool_def.get("description", "")
             tool_schema = tool_def.get("inputSchema", {})
@@ -171,33 +300,111 @@ class ConfluenceAgentChatbot:
                 name=tool_name,
                 description=tool_description,
                 input_schema=tool_schema
-            )(partial(self._active_projects_tool_handler, tool_name))
+            )(partial(self._traced_tool_call, self.tool_handlers[tool_name], tool_name))
             
             agent_tools.append(agent_tool)
         
         return agent_tools
     
-    def create_session(self, system_prompt: str = None) -> ClaudeSDKClient:
+    def _build_mcp_server(self) -> None:
+        """(Re)create the Agent SDK tool wrappers and the in-process MCP server serving them."""
+        from claude_agent_sdk import create_sdk_mcp_server
+        
+        self.agent_tools = self._create_agent_tools()
+        self.mcp_server = create_sdk_mcp_server(
+            name="cdata_connect",
+            tools=self.agent_tools
+        )
+    
+    def current_system_prompt(self) -> str:
+        """Return the override prompt, else the PromptManager's prompt for the current snapshot."""
+        if self.system_prompt:
+            return self.system_prompt
+        if self.prompt_manager:
+            return self.prompt_manager.get_system_prompt()
+        return LEGACY_SYSTEM_PROMPT
+    
+    def create_session(self, system_prompt: str = None, resume: str = None) -> "ClaudeSDKClient":
         """
         Create a stateful conversation session.
         
         Args:
-            system_prompt: Custom system prompt (uses default if not provided)
+            system_prompt: Custom system prompt, kept for later sessions (uses the
+                PromptManager's prompt, or the default, if not provided)
+            resume: Session id of an earlier conversation to continue
         """
-        prompt = system_prompt or LEGACY_SYSTEM_PROMPT
+        from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
+        
+        if system_prompt:
+            self.system_prompt = system_prompt
+        self.session_prompt = self.current_system_prompt()
         options = ClaudeAgentOptions(
-            system_prompt=prompt,
+            system_prompt=self.session_prompt,
             mcp_servers={"cdata_connect": self.mcp_server},
-            permission_mode="bypassPermissions"  # Auto-approve for CLI
+            permission_mode="bypassPermissions",  # Auto-approve for CLI
+            resume=resume,
         )
         return ClaudeSDKClient(options=options)
     
-    async def chat_session(self, client: ClaudeSDKClient, user_message: str) -> str:
-        """Send a message in a stateful session."""
-        await client.query(user_message)
-        async for message in client.receive_response():
-            if hasattr(message, 'result'):
-                return str(message.result)
+    async def prepare_turn(self, client: "ClaudeSDKClient", user_message: str) -> "ClaudeSDKClient":
+        """
+        Pick the tools and system prompt for the next turn.
+        
+        When the message needs tools that aren't exposed yet, or the active
+        projects snapshot changed the system prompt, the conversation is resumed
+        on a new client (tools and prompt are fixed for the lifetime of a
+        client). Returns the client to use for the turn.
+        """
+        expand_tools = bool(self.tool_selector) and self.tool_selector.needs_extended(user_message)
+        if expand_tools:
+            self.tool_selector.expand()
+            self._build_mcp_server()
+        prompt_changed = self.current_system_prompt() != self.session_prompt
+        
+        if expand_tools or prompt_changed:
+            await client.disconnect()
+            client = self.create_session(resume=self.session_id)
+            await client.connect()
+            if expand_tools:
+                print("  [tools] Added extended CData tools for this conversation")
+            if prompt_changed:
+                print("  [prompt] Active projects changed - refreshed the system prompt")
+        
+        if not self.tool_selector:
+            return client
+        
+        report = self.tool_selector.token_report()
+        metrics.inc("tool_prompt_tokens_saved_total", report["saved_tokens"])
+        print(
+            f"  [tools] {report['exposed_count']}/{report['total_count']} tools exposed, "
+            f"~{report['saved_tokens']} prompt tokens saved per request "
+            f"({report['exposed_tokens']} vs {report['full_tokens']})"
+        )
+        return client
+    
+    async def chat_session(self, client: "ClaudeSDKClient", user_message: str) -> str:
+        """
+        Send a message in a stateful session.
+        When tracing is enabled, the gap before each streamed message is
+        recorded as model time and tool-use/thinking blocks as instant events.
+        """
+        with tracer.span("chat turn", cat="chat", message=user_message[:200]):
+            with tracer.span("query", cat="chat"):
+                await client.query(user_message)
+            waiting_since = tracer.now()
+            async for message in client.receive_response():
+                message_type = type(message).__name__
+                tracer.add_complete(f"model -> {message_type}", "model", waiting_since, tracer.now())
+                for block in getattr(message, 'content', None) or []:
+                    block_type = type(block).__name__
+                    if block_type == "ToolUseBlock":
+                        tracer.instant(f"tool_use {block.name}", "model", input=block.input)
+                    elif block_type == "ThinkingBlock":
+                        tracer.instant("thinking", "model", chars=len(block.thinking))
+                if hasattr(message, 'result'):
+                    self.session_id = getattr(message, 'session_id', None) or self.session_id
+                    return str(message.result)
+                waiting_since = tracer.now()
         return ""
 
 
@@ -207,7 +414,7 @@ async def interactive_mode(chatbot, system_prompt: str = None):
     
     Args:
         chatbot: The ConfluenceAgentChatbot instance
-        system_prompt: Custom system prompt to use for the session
+        system_prompt: Custom system prompt to use instead of the chatbot's PromptManager
     """
     print("\n" + "=" * 60)
     print("Assistant Ready!")
@@ -217,13 +424,15 @@ async def interactive_mode(chatbot, system_prompt: str = None):
     print("  - 'Tell me about the Thrivent project'")
     print("  - 'What Confluence pages exist for Medtronic?'")
     print("  - 'Is Acme Corp an active project?'")
-    print("\nType 'quit' to exit.\n")
+    print("\nType '/stats' for tool and upstream metrics, 'quit' to exit.\n")
     
     # Create a stateful session with the dynamic system prompt
     client = chatbot.create_session(system_prompt=system_prompt)
     
-    # Use async context manager for proper resource cleanup
-    async with client:
+    # Connect explicitly (not `async with`) - prepare_turn may swap in a new client
+    await client.connect()
+    try:
+        turn = 1
         while True:
             user_input = input("You: ").strip()
             
@@ -234,16 +443,31 @@ async def interactive_mode(chatbot, system_prompt: str = None):
                 print("Goodbye!")
                 break
             
+            if user_input.lower() == "/stats":
+                print(f"\n{metrics.format_stats()}\n")
+                continue
+            
             print("\nThinking...")
+            client = await chatbot.prepare_turn(client, user_input)
             response = await chatbot.chat_session(client, user_input)
             print(f"\nAssistant:\n{response}\n")
+            
+            trace_path = tracer.flush(f"turn-{turn}")
+            if trace_path:
+                print(f"[trace] {trace_path}\n")
+            turn += 1
+    finally:
+        await client.disconnect()
 
 
 async def main():
     """Run the chatbot in interactive mode with active projects integration."""
-    MCP_SERVER_URL = "https://mcp.cloud.cdata.com/mcp/"
+    MCP_SERVER_URL = os.environ.get("CDATA_MCP_SERVER_URL", "https://mcp.cloud.cdata.com/mcp/")
     CDATA_EMAIL = os.environ.get("CDATA_EMAIL")
     CDATA_ACCESS_TOKEN = os.environ.get("CDATA_ACCESS_TOKEN")
+    CDATA_SCOPE_PUSHDOWN = os.environ.get("CDATA_SCOPE_PUSHDOWN", "").lower() in ("1", "true", "yes")
+    DYNAMIC_TOOLS = os.environ.get("DYNAMIC_TOOLS", "true").lower() in ("1", "true", "yes")
+    METADATA_WARM = os.environ.get("METADATA_WARM", "").lower() in ("1", "true", "yes")
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
     
     # Validate environment variables
@@ -262,29 +486,105 @@ async def main():
     print("=" * 60)
     print(f"CData MCP Server: {MCP_SERVER_URL}\n")
     
-    # Load active projects from TSG Capacity Management Tool
-    print("Loading active projects from TSG Capacity Management Tool...")
+    # Optional per-turn Chrome trace files (open in https://ui.perfetto.dev)
+    TRACE_DIR = os.environ.get("TRACE_DIR")
+    if TRACE_DIR:
+        tracer.configure(TRACE_DIR)
+        print(f"Tracing: writing per-turn traces to {TRACE_DIR}")
+    
+    # Optional metrics export (Prometheus endpoint and/or periodic JSON file)
+    METRICS_PORT = os.environ.get("METRICS_PORT")
+    METRICS_JSON_PATH = os.environ.get("METRICS_JSON_PATH")
+    if METRICS_PORT:
+        start_http_server(int(METRICS_PORT))
+        print(f"Metrics: http://127.0.0.1:{METRICS_PORT}/metrics")
+    if METRICS_JSON_PATH:
+        start_json_exporter(METRICS_JSON_PATH, float(os.environ.get("METRICS_JSON_INTERVAL", "30")))
+        print(f"Metrics: writing {METRICS_JSON_PATH}")
+    
+    # Live HTTP unless TRANSPORT_MODE=record/replay (see scripts/transport.py)
     try:
-        project_count = active_projects_cache.load()
+        transport_mode = configure_transport_from_env()
+    except (ValueError, OSError) as e:  # Unknown mode, bad time scale or unreadable cassette
+        print(f"Error: {e}")
+        return
+    if transport_mode != "live":
+        print(f"Transport: {transport_mode} ({os.environ.get('TRANSPORT_CASSETTE', DEFAULT_CASSETTE_PATH)})")
+    
+    # Load active projects from TSG Capacity Management Tool (plus any local sources), concurrently,
+    # or attach to the snapshot a refresher process publishes (python -m scripts.shared_snapshot)
+    PROJECTS_SNAPSHOT = os.environ.get("PROJECTS_SNAPSHOT")
+    active_projects_cache.sources = sources_from_env()
+    if PROJECTS_SNAPSHOT:
+        print(f"Attaching to shared active projects snapshot {PROJECTS_SNAPSHOT}...")
+    else:
+        source_names = ", ".join(source.name for source in active_projects_cache.sources)
+        print(f"Loading active projects from {source_names}...")
+    try:
+        if PROJECTS_SNAPSHOT:
+            project_count = active_projects_cache.attach(PROJECTS_SNAPSHOT)
+        else:
+            project_count = active_projects_cache.load()
         sample_names = active_projects_cache.get_sample_names(10)
+        for source_name, error in active_projects_cache.source_errors.items():
+            print(f"Warning: Skipped project source {source_name}: {error}")
         print(f"Loaded {project_count} active projects/clients")
         print(f"Sample: {', '.join(sample_names[:5])}...")
     except Exception as e:
         print(f"Warning: Could not load active projects: {e}")
         print("Continuing without active projects filtering...")
-        project_count = 0
-        sample_names = []
     
-    # Build dynamic system prompt with active projects context
-    system_prompt = build_scalable_system_prompt(project_count, sample_names)
+    # Load the full TCM dump into the local store for offline analytics
+    try:
+        issue_count = tcm_store.load(DEFAULT_DUMP_PATH)
+        print(f"Loaded {issue_count} TCM issues from {DEFAULT_DUMP_PATH}")
+    except FileNotFoundError:
+        print(f"No TCM dump at {DEFAULT_DUMP_PATH} - offline TCM tools disabled")
+    except Exception as e:
+        print(f"Warning: Could not load TCM dump: {e}")
+    
+    # Inject the full project list if it fits the budget, otherwise summary + tools
+    prompt_manager = PromptManager(
+        active_projects_cache,
+        token_budget=int(os.environ.get("PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET)),
+    )
+    print(
+        f"System prompt: {prompt_manager.strategy()} "
+        f"(project list ~{prompt_manager.estimate_list_tokens()} tokens, budget {prompt_manager.token_budget})"
+    )
     
     print()  # Blank line before chatbot init
     
     # Initialize chatbot with CData tools + Active Projects tools
-    chatbot = ConfluenceAgentChatbot(MCP_SERVER_URL, CDATA_EMAIL, CDATA_ACCESS_TOKEN)
+    chatbot = ConfluenceAgentChatbot(
+        MCP_SERVER_URL,
+        CDATA_EMAIL,
+        CDATA_ACCESS_TOKEN,
+        scope_pushdown=CDATA_SCOPE_PUSHDOWN,
+        dynamic_tools=DYNAMIC_TOOLS,
+        prompt_manager=prompt_manager,
+    )
+    
+    # Prefetch CData metadata while the user types their first question
+    if METADATA_WARM:
+        catalogs = os.environ.get("METADATA_WARM_CATALOGS")
+        chatbot.start_metadata_warmer(
+            concurrency=int(os.environ.get("METADATA_WARM_CONCURRENCY", DEFAULT_WARM_CONCURRENCY)),
+            max_tables=int(os.environ.get("METADATA_WARM_MAX_TABLES", DEFAULT_MAX_TABLES)),
+            catalogs=[c.strip() for c in catalogs.split(",")] if catalogs else None,
+        )
+        print("Metadata: warming catalogs, schemas, tables and columns in the background")
     
-    # Start interactive mode with the dynamic system prompt
-    await interactive_mode(chatbot, system_prompt=system_prompt)
+    trace_path = tracer.flush("startup")
+    if trace_path:
+        print(f"[trace] {trace_path}")
+    
+    # Start interactive mode; the prompt follows the active projects snapshot
+    try:
+        await interactive_mode(chatbot)
+    finally:
+        if chatbot.metadata_warmer:
+            chatbot.metadata_warmer.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+Benchmarks package - Offline benchmark suite and local fake servers.
+"""
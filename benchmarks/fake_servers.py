@@ -0,0 +1,229 @@
+"""
+Fake Servers - Local stand-ins for Jira and the CData MCP server.
+Used by the benchmark suite and offline tests so performance can be
+measured without touching live Jira or CData.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Tools advertised by the real CData Connect AI MCP server
+CDATA_TOOL_NAMES = [
+    "getInstructions",
+    "queryData",
+    "getCatalogs",
+    "getColumns",
+    "getProcedureParameters",
+    "getProcedures",
+    "executeProcedure",
+    "getSchemas",
+    "getTables",
+]
+
+
+def make_tcm_issues(project_count: int, other_count: int = 0) -> list[dict]:
+    """
+    Build synthetic TCM issues in Jira search format.
+    The first project_count issues are Clients/Projects, the rest Candidates.
+    """
+    issues = []
+    for i in range(project_count + other_count):
+        if i < project_count:
+            issuetype = "Client" if i % 5 == 0 else "Project"
+            summary = f"Client {i // 5}" if issuetype == "Client" else f"Client {i // 5} Project {i % 5}"
+        else:
+            issuetype = "Candidate"
+            summary = f"Candidate {i}"
+        issues.append({
+            "key": f"TCM-{i + 1}",
+            "fields": {
+                "summary": summary,
+                "issuetype": {"name": issuetype},
+                "status": {"name": "Active" if i % 3 else "Done"},
+            },
+        })
+    return issues
+
+
+class _FakeServer:
+    """Base class: runs a ThreadingHTTPServer on a background thread."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server = None
+
+    def _handle(self, path: str, body: dict) -> tuple[int, str, str]:
+        """Return (status, content_type, body) for a POST request."""
+        raise NotImplementedError
+
+    def start(self) -> "_FakeServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment - otherwise Nagle + delayed ACK
+            # adds ~40ms to every small keep-alive response
+            disable_nagle_algorithm = True
+            wbufsize = -1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                with fake._count_lock:
+                    fake.request_count += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                try:
+                    status, content_type, text = fake._handle(self.path, json.loads(raw or b"{}"))
+                except ValueError as e:
+                    status, content_type, text = 400, "text/plain", str(e)
+                body = text.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeJiraServer(_FakeServer):
+    """
+    Imitates POST /rest/api/3/search/jql with nextPageToken pagination.
+    JQL filtering only understands the `issuetype in (...)` clause used by
+    get_active_projects_from_tcm; anything else returns every issue.
+    """
+
+    def __init__(self, project_count: int = 100, other_count: int = 0, latency: float = 0.0):
+        super().__init__(latency)
+        self.set_issues(project_count, other_count)
+
+    def set_issues(self, project_count: int, other_count: int = 0) -> None:
+        """Replace the served dataset."""
+        self.issues = make_tcm_issues(project_count, other_count)
+
+    def _handle(self, path: str, body: dict) -> tuple[int, str, str]:
+        if path != "/rest/api/3/search/jql":
+            return 404, "text/plain", "Not found"
+
+        issues = self.issues
+        match = re.search(r"issuetype\s+in\s*\(([^)]*)\)", body.get("jql", ""), re.IGNORECASE)
+        if match:
+            wanted = {t.strip().strip('"\'') for t in match.group(1).split(",")}
+            issues = [i for i in issues if i["fields"]["issuetype"]["name"] in wanted]
+
+        start = int(body.get("nextPageToken") or 0)
+        page_size = int(body.get("maxResults") or 50)
+        page = issues[start:start + page_size]
+        is_last = start + page_size >= len(issues)
+
+        data = {"issues": page, "isLast": is_last}
+        if not is_last:
+            data["nextPageToken"] = str(start + page_size)
+        return 200, "application/json", json.dumps(data)
+
+
+class FakeCDataServer(_FakeServer):
+    """
+    Imitates the CData Connect AI MCP endpoint: JSON-RPC 2.0 requests,
+    answered as Server-Sent Events. tools/call returns a text result of
+    roughly payload_bytes bytes, except the metadata tools (getCatalogs ...
+    getColumns), which describe metadata_fanout catalogs, schemas per
+    catalog, tables per schema and columns per table.
+    """
+
+    def __init__(self, payload_bytes: int = 1024, latency: float = 0.0, metadata_fanout: int = 2):
+        super().__init__(latency)
+        self.payload_bytes = payload_bytes
+        self.metadata_fanout = metadata_fanout
+
+    @staticmethod
+    def tool_definitions() -> list[dict]:
+        return [
+            {
+                "name": name,
+                "description": f"{name} tool (fake CData server). " * 8,
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "SQL query to run"},
+                        "catalogName": {"type": "string", "description": "Catalog (connection) name"},
+                        "schemaName": {"type": "string", "description": "Schema name"},
+                        "tableName": {"type": "string", "description": "Table name"},
+                    },
+                    "required": [],
+                },
+            }
+            for name in CDATA_TOOL_NAMES
+        ]
+
+    def _metadata_rows(self, name: str, arguments: dict) -> list[dict]:
+        """Rows shaped like CData's sys_catalogs/sys_schemas/sys_tables/sys_tablecolumns."""
+        n = range(self.metadata_fanout)
+        catalog, schema, table = (arguments.get(k) for k in ("catalogName", "schemaName", "tableName"))
+        if name == "getCatalogs":
+            return [{"CatalogName": f"Catalog{i}"} for i in n]
+        if name == "getSchemas":
+            return [{"CatalogName": catalog, "SchemaName": f"Schema{i}"} for i in n]
+        if name == "getTables":
+            return [{"CatalogName": catalog, "SchemaName": schema, "TableName": f"Table{i}"} for i in n]
+        return [
+            {"CatalogName": catalog, "SchemaName": schema, "TableName": table, "ColumnName": f"Column{i}", "DataType": "varchar"}
+            for i in n
+        ]
+
+    def _tool_result(self, name: str, arguments: dict) -> dict:
+        if name in ("getCatalogs", "getSchemas", "getTables", "getColumns"):
+            return {
+                "content": [{"type": "text", "text": json.dumps(self._metadata_rows(name, arguments))}],
+                "isError": False,
+            }
+        row = {"tool": name, "arguments": arguments, "value": ""}
+        overhead = len(json.dumps(row))
+        row_count = max(1, self.payload_bytes // max(overhead + 64, 1))
+        row["value"] = "x" * 64
+        return {
+            "content": [{"type": "text", "text": json.dumps([row] * row_count)}],
+            "isError": False,
+        }
+
+    def _handle(self, path: str, body: dict) -> tuple[int, str, str]:
+        method = body.get("method")
+        if method == "tools/list":
+            result = {"tools": self.tool_definitions()}
+        elif method == "tools/call":
+            params = body.get("params") or {}
+            result = self._tool_result(params.get("name"), params.get("arguments") or {})
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+
+        message = {"jsonrpc": "2.0", "id": body.get("id"), "result": result}
+        return 200, "text/event-stream", f"event: message\ndata: {json.dumps(message)}\n\n"
@@ -0,0 +1,154 @@
+"""
+Load Generator - Replays many concurrent conversations through the chatbot's
+tool handlers using a recorded cassette, without touching Jira or CData.
+
+Each simulated conversation checks a project with is_project_active and then
+issues every CData tool call found in the cassette, in recorded order, through
+the same handler path the Agent SDK uses.
+
+Record a cassette first (live services or the fake servers), e.g.:
+    TRANSPORT_MODE=record TRANSPORT_CASSETTE=cassettes/session.jsonl.gz python agent_chatbot.py
+
+Then:
+    python -m benchmarks.load_generator cassettes/session.jsonl.gz \\
+        --conversations 200 --concurrency 20 --time-scale 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.metrics import LatencyHistogram
+from scripts.transport import ReplayTransport, load_cassette, set_default_transport
+
+JIRA_SEARCH_PATH = "/rest/api/3/search/jql"
+
+
+def conversation_script(cassette_path: str) -> tuple[str, list[tuple[str, dict]]]:
+    """
+    Extract the MCP server URL and the recorded sequence of CData tool calls.
+    Returns (server_url, [(tool_name, arguments), ...]).
+    """
+    server_url = None
+    calls = []
+    for entry in load_cassette(cassette_path):
+        request = entry.get("request") or {}
+        method = request.get("method")
+        if method == "tools/list":
+            server_url = entry["url"]
+        elif method == "tools/call":
+            server_url = server_url or entry["url"]
+            params = request.get("params") or {}
+            calls.append((params.get("name"), params.get("arguments") or {}))
+    if server_url is None:
+        raise ValueError(f"{cassette_path} has no MCP tools/list or tools/call exchanges")
+    return server_url, calls
+
+
+async def run_load(
+    cassette_path: str,
+    conversations: int,
+    concurrency: int,
+    time_scale: float,
+) -> dict:
+    """Replay `conversations` conversations, at most `concurrency` at a time."""
+    transport = ReplayTransport(cassette_path, time_scale)
+    set_default_transport(transport)
+    server_url, calls = conversation_script(cassette_path)
+
+    # Point the Jira fetch at the recorded host; credentials only need to be present
+    for entry in transport.entries:
+        if entry["url"].endswith(JIRA_SEARCH_PATH):
+            os.environ["JIRA_BASE_URL"] = entry["url"][:-len(JIRA_SEARCH_PATH)]
+            os.environ.setdefault("JIRA_EMAIL", "replay")
+            os.environ.setdefault("JIRA_API_TOKEN", "replay")
+            break
+
+    # Imported after JIRA_* is set - get_active_projects reads it at import time
+    from agent_chatbot import ConfluenceAgentChatbot
+    from scripts.active_projects_cache import active_projects_cache
+
+    # Active projects come from the cassette too, if the Jira search was recorded
+    try:
+        active_projects_cache.load()
+    except Exception as e:
+        print(f"Active projects not in cassette ({e}); is_project_active will report no matches")
+    names = active_projects_cache.get_names() or ["Acme Corp"]
+
+    chatbot = ConfluenceAgentChatbot(server_url, "replay", "replay", transport=transport)
+
+    call_latency = LatencyHistogram()
+    conversation_latency = LatencyHistogram()
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call(handler, tool_name: str, args: dict) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            await chatbot._traced_tool_call(handler, tool_name, args)
+        except Exception:
+            errors += 1
+        call_latency.record(time.perf_counter() - start)
+
+    async def conversation(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await timed_call(
+                chatbot._active_projects_tool_handler,
+                "is_project_active",
+                {"project_name": names[index % len(names)]},
+            )
+            for tool_name, args in calls:
+                await timed_call(chatbot._cdata_tool_handler, tool_name, args)
+            conversation_latency.record(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation(i) for i in range(conversations)))
+    wall = time.perf_counter() - start
+
+    total_calls = call_latency.count
+    return {
+        "conversations": conversations,
+        "concurrency": concurrency,
+        "time_scale": time_scale,
+        "calls_per_conversation": len(calls) + 1,
+        "wall_seconds": wall,
+        "conversations_per_second": conversations / wall,
+        "calls_per_second": total_calls / wall,
+        "errors": errors,
+        # Average number of tool calls actually in flight. Well below
+        # `concurrency` means calls are serializing somewhere (contention).
+        "effective_concurrency": call_latency.sum / wall,
+        "call_latency": call_latency.to_dict(),
+        "conversation_latency": conversation_latency.to_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay concurrent conversations from a cassette")
+    parser.add_argument("cassette", help="cassette recorded with TRANSPORT_MODE=record")
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="multiplier for recorded latency (0 = as fast as possible)")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.cassette, args.conversations, args.concurrency, args.time_scale))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
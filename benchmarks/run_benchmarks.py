@@ -0,0 +1,292 @@
+"""
+Benchmarks - Offline performance suite for the assistant.
+Runs against local fake Jira and CData MCP servers, writes a machine-readable
+JSON report, and optionally compares it against a saved baseline.
+
+Usage (from the project root):
+    python -m benchmarks.run_benchmarks                  # full run
+    python -m benchmarks.run_benchmarks --quick          # smaller sizes, fewer repeats
+    python -m benchmarks.run_benchmarks --save-baseline  # record a new baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+
+Exits with status 1 if any metric regressed beyond --tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fake_servers import FakeJiraServer, FakeCDataServer
+
+AGENT_PATH = os.path.join(PROJECT_ROOT, "agent_chatbot.py")
+READY_MARKER = "Assistant Ready!"
+DEFAULT_OUTPUT = os.path.join(PROJECT_ROOT, "benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+
+# Credentials are only checked for presence - the fake servers accept anything
+FAKE_ENV = {
+    "JIRA_EMAIL": "bench@example.com",
+    "JIRA_API_TOKEN": "bench",
+    "CDATA_EMAIL": "bench@example.com",
+    "CDATA_ACCESS_TOKEN": "bench",
+    "ANTHROPIC_API_KEY": "bench",
+}
+
+# Every optional setting pinned to its default for the measured process, so
+# the caller's environment (or a .env file, which doesn't override set
+# variables) can't change what startup does and baselines compare across hosts
+STARTUP_ENV = {
+    "TRACE_DIR": "",
+    "METRICS_PORT": "",
+    "METRICS_JSON_PATH": "",
+    "TRANSPORT_MODE": "live",
+    "TRANSPORT_CASSETTE": "",
+    "TRANSPORT_TIME_SCALE": "1.0",
+    "PROJECTS_SNAPSHOT": "",
+    "PROJECT_SOURCE_TCM": "true",
+    "PROJECT_SOURCE_CSV": "",
+    "PROJECT_SOURCE_SQLITE": "",
+    "PROJECT_SOURCE_TIMEOUT": "",
+    "PROMPT_TOKEN_BUDGET": "2000",
+    "CDATA_SCOPE_PUSHDOWN": "false",
+    "DYNAMIC_TOOLS": "true",
+    "METADATA_WARM": "false",
+}
+
+
+def _metric(name: str, value: float, unit: str, better: str) -> dict:
+    return {"name": name, "value": value, "unit": unit, "better": better}
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def bench_startup(jira_url: str, cdata_url: str, runs: int) -> list[dict]:
+    """Cold start of agent_chatbot.main in a fresh interpreter, up to the ready prompt."""
+    env = {**os.environ, **FAKE_ENV, **STARTUP_ENV}
+    env.update({
+        "JIRA_BASE_URL": jira_url,
+        "CDATA_MCP_SERVER_URL": cdata_url,
+        "PYTHONUNBUFFERED": "1",
+    })
+
+    timings = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.Popen(
+                [sys.executable, AGENT_PATH],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                cwd=cwd, env=env, text=True,
+            )
+            output = []
+            try:
+                for line in proc.stdout:
+                    output.append(line)
+                    if READY_MARKER in line:
+                        timings.append(time.perf_counter() - start)
+                        break
+                else:
+                    raise RuntimeError("agent_chatbot exited before it was ready:\n" + "".join(output))
+            finally:
+                proc.kill()
+                proc.wait()
+
+    return [_metric("startup_seconds", _median(timings), "s", "lower")]
+
+
+def bench_cache(jira: FakeJiraServer, sizes: list[int], min_seconds: float) -> list[dict]:
+    """ActiveProjectsCache.load and is_active throughput at each project count."""
+    from scripts.active_projects_cache import ActiveProjectsCache
+
+    results = []
+    for size in sizes:
+        jira.set_issues(size)
+        cache = ActiveProjectsCache()
+        start = time.perf_counter()
+        cache.load()
+        load_seconds = time.perf_counter() - start
+        assert cache.count() == size, f"expected {size} projects, loaded {cache.count()}"
+
+        middle = cache.list_all()[size // 2]
+        queries = [
+            middle["key"],              # exact key
+            middle["name"],             # exact name
+            middle["name"][:-2],        # partial name
+            "Acme Corp",                # miss
+        ]
+        iterations = 0
+        start = time.perf_counter()
+        while True:
+            for q in queries:
+                cache.is_active(q)
+            iterations += len(queries)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds and iterations >= 20:
+                break
+
+        results.append(_metric(f"cache_load_seconds[n={size}]", load_seconds, "s", "lower"))
+        results.append(_metric(f"is_active_ops_per_second[n={size}]", iterations / elapsed, "ops/s", "higher"))
+    return results
+
+
+def bench_mcp_client(cdata: FakeCDataServer, payload_sizes: list[int], calls: int) -> list[dict]:
+    """Sequential MCPClient.call_tool throughput and latency per response size."""
+    from agent_chatbot import MCPClient
+    from scripts.metrics import LatencyHistogram
+
+    client = MCPClient(cdata.url, FAKE_ENV["CDATA_EMAIL"], FAKE_ENV["CDATA_ACCESS_TOKEN"])
+    results = []
+    for payload_bytes in payload_sizes:
+        cdata.payload_bytes = payload_bytes
+        client.call_tool("queryData", {"query": "SELECT 1"})  # warm the connection pool
+
+        histogram = LatencyHistogram()
+        start = time.perf_counter()
+        for _ in range(calls):
+            call_start = time.perf_counter()
+            client.call_tool("queryData", {"query": "SELECT * FROM Issues"})
+            histogram.record(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+
+        label = f"payload={payload_bytes}"
+        results.append(_metric(f"mcp_calls_per_second[{label}]", calls / elapsed, "calls/s", "higher"))
+        results.append(_metric(f"mcp_call_p50_seconds[{label}]", histogram.quantile(0.5), "s", "lower"))
+        results.append(_metric(f"mcp_call_p99_seconds[{label}]", histogram.quantile(0.99), "s", "lower"))
+    return results
+
+
+def bench_first_question(cdata: FakeCDataServer, runs: int) -> list[dict]:
+    """Discovery sequence (getCatalogs -> getColumns) latency, cold vs after the metadata warmer ran."""
+    import asyncio
+    from agent_chatbot import ConfluenceAgentChatbot
+
+    async def discovery(chatbot) -> float:
+        start = time.perf_counter()
+        await chatbot._cdata_tool_handler("getCatalogs", {})
+        await chatbot._cdata_tool_handler("getSchemas", {"catalogName": "Catalog0"})
+        await chatbot._cdata_tool_handler("getTables", {"catalogName": "Catalog0", "schemaName": "Schema0"})
+        await chatbot._cdata_tool_handler(
+            "getColumns", {"catalogName": "Catalog0", "schemaName": "Schema0", "tableName": "Table0"}
+        )
+        return time.perf_counter() - start
+
+    cold, warm = [], []
+    for _ in range(runs):
+        chatbot = ConfluenceAgentChatbot(cdata.url, FAKE_ENV["CDATA_EMAIL"], FAKE_ENV["CDATA_ACCESS_TOKEN"])
+        cold.append(asyncio.run(discovery(chatbot)))
+        chatbot.start_metadata_warmer()
+        chatbot.metadata_warmer.wait()
+        warm.append(asyncio.run(discovery(chatbot)))
+        chatbot.metadata_warmer.stop()
+    return [
+        _metric("first_question_discovery_seconds[cold]", _median(cold), "s", "lower"),
+        _metric("first_question_discovery_seconds[warmed]", _median(warm), "s", "lower"),
+    ]
+
+
+def compare(current: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Return a description of every metric that regressed beyond tolerance."""
+    baseline_by_name = {m["name"]: m for m in baseline}
+    regressions = []
+    for m in current:
+        base = baseline_by_name.get(m["name"])
+        if not base or not base["value"]:
+            continue
+        ratio = m["value"] / base["value"]
+        if m["better"] == "lower" and ratio > 1 + tolerance or m["better"] == "higher" and ratio < 1 - tolerance:
+            regressions.append(f"{m['name']}: {base['value']:.6g} -> {m['value']:.6g} {m['unit']} ({ratio:.2f}x)")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(quick: bool = False) -> dict:
+    """Run every benchmark and return the report."""
+    sizes = [100, 10_000] if quick else [100, 10_000, 100_000]
+    startup_runs = 1 if quick else 3
+    mcp_calls = 50 if quick else 300
+
+    with FakeJiraServer() as jira, FakeCDataServer() as cdata, FakeCDataServer(latency=0.05) as slow_cdata:
+        # get_active_projects reads Jira settings at import time
+        os.environ.update(FAKE_ENV)
+        os.environ["JIRA_BASE_URL"] = jira.url
+
+        results = []
+        print("Benchmarking cold startup...")
+        results += bench_startup(jira.url, cdata.url, startup_runs)
+        print("Benchmarking active projects cache...")
+        results += bench_cache(jira, sizes, min_seconds=0.2 if quick else 1.0)
+        print("Benchmarking MCP client...")
+        results += bench_mcp_client(cdata, [1024, 64 * 1024], mcp_calls)
+        print("Benchmarking first-question metadata discovery...")
+        results += bench_first_question(slow_cdata, startup_runs)
+
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON report")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the report to --baseline")
+    args = parser.parse_args()
+
+    report = run(quick=args.quick)
+
+    for m in report["results"]:
+        print(f"  {m['name']}: {m['value']:.6g} {m['unit']}")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for r in regressions:
+                print(f"  - {r}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
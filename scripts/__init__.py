@@ -1,41 +1,92 @@
 """
 Scripts package - Contains active projects fetching, caching, and tools.
+
+Submodules are imported lazily on first attribute access (PEP 562), so
+`from scripts import ActiveProjectsCache` doesn't pull in the Jira client,
+run load_dotenv(), or load any other submodule it doesn't need.
+
+The shared instances are exported under names that differ from their
+submodules (default_metrics, not metrics), so `scripts.metrics` is always
+the module.
 """
 
-from scripts.get_active_projects import (
-    get_active_projects_from_tcm,
-    get_active_projects_keys_and_names,
-)
-from scripts.active_projects_cache import (
-    ActiveProjectsCache,
-    active_projects_cache,
-)
-from scripts.active_projects_tools import (
-    get_active_projects_tool_definitions,
-    get_active_projects_tool_handlers,
-    handle_list_active_projects,
-    handle_is_project_active,
-)
-from scripts.system_prompts import (
-    build_scalable_system_prompt,
-    build_simple_system_prompt,
-    LEGACY_SYSTEM_PROMPT,
-)
-
-__all__ = [
+import importlib
+
+# Public name -> submodule that defines it ("submodule:attribute" if the
+# attribute has a different name)
+_EXPORTS = {
     # Fetching
-    "get_active_projects_from_tcm",
-    "get_active_projects_keys_and_names",
+    "get_active_projects_from_tcm": "get_active_projects",
+    "get_active_projects_keys_and_names": "get_active_projects",
     # Cache
-    "ActiveProjectsCache",
-    "active_projects_cache",
+    "ActiveProjectsCache": "active_projects_cache",
+    "default_active_projects_cache": "active_projects_cache:active_projects_cache",
+    # Project sources
+    "ProjectSource": "project_sources",
+    "TCMSource": "project_sources",
+    "CSVSource": "project_sources",
+    "SQLiteSource": "project_sources",
+    "fetch_all": "project_sources",
+    "merge_projects": "project_sources",
+    "sources_from_env": "project_sources",
+    # Shared snapshot
+    "SharedSnapshot": "shared_snapshot",
+    "publish_snapshot": "shared_snapshot",
     # Tools
-    "get_active_projects_tool_definitions",
-    "get_active_projects_tool_handlers",
-    "handle_list_active_projects",
-    "handle_is_project_active",
+    "get_active_projects_tool_definitions": "active_projects_tools",
+    "get_active_projects_tool_handlers": "active_projects_tools",
+    "handle_list_active_projects": "active_projects_tools",
+    "handle_is_project_active": "active_projects_tools",
+    # Metrics
+    "MetricsRegistry": "metrics",
+    "default_metrics": "metrics:metrics",
+    # Tracing
+    "Tracer": "tracing",
+    "tracer": "tracing",
+    # Transport
+    "LiveTransport": "transport",
+    "RecordingTransport": "transport",
+    "ReplayTransport": "transport",
+    "configure_transport_from_env": "transport",
+    "get_default_transport": "transport",
+    "set_default_transport": "transport",
+    # Query scoping
+    "scope_query": "query_scope",
+    # TCM Store
+    "TCMStore": "tcm_store",
+    "default_tcm_store": "tcm_store:tcm_store",
+    "get_tcm_tool_definitions": "tcm_tools",
+    "get_tcm_tool_handlers": "tcm_tools",
+    "handle_tcm_breakdown": "tcm_tools",
+    "handle_search_tcm_issues": "tcm_tools",
+    # Tool selection
+    "ToolSelector": "tool_selection",
+    "compact_tool_def": "tool_selection",
+    # Metadata warmer
+    "MetadataStore": "metadata_warmer",
+    "MetadataWarmer": "metadata_warmer",
     # Prompts
-    "build_scalable_system_prompt",
-    "build_simple_system_prompt",
-    "LEGACY_SYSTEM_PROMPT",
-]
+    "build_scalable_system_prompt": "system_prompts",
+    "build_simple_system_prompt": "system_prompts",
+    "LEGACY_SYSTEM_PROMPT": "system_prompts",
+    "format_project_list": "system_prompts",
+    "project_list_length": "system_prompts",
+    "PromptManager": "prompt_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    target = _EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    submodule, _, attribute = target.partition(":")
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), attribute or name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
@@ -1,56 +1,148 @@
 """
-Active Projects Cache - Caches active projects from TCM at startup.
+Active Projects Cache - Caches active projects from TCM (and any other
+configured project sources) at startup.
 Provides efficient lookup without repeated API calls.
 """
 
 from typing import Optional
 
+from scripts.metrics import metrics
+from scripts.tracing import tracer
+
+
+class _MemorySnapshot:
+    """
+    In-process project list with key and name indexes.
+    scripts.shared_snapshot.SharedSnapshot provides the same methods over
+    a memory-mapped file shared between processes.
+    """
+    
+    def __init__(self, projects: list[dict], generation: int):
+        self.generation = generation
+        self._projects = projects
+        self._by_key: dict[str, dict] = {}
+        self._by_name: dict[str, list[dict]] = {}
+        for p in projects:
+            self._by_key.setdefault(p["key"].upper(), p)
+            self._by_name.setdefault(p["name"].lower(), []).append(p)
+    
+    def count(self) -> int:
+        return len(self._projects)
+    
+    def list_all(self) -> list[dict]:
+        return self._projects
+    
+    def keys(self) -> list[str]:
+        return [p["key"] for p in self._projects]
+    
+    def names(self) -> list[str]:
+        return [p["name"] for p in self._projects]
+    
+    def sample(self, limit: int) -> list[dict]:
+        return self._projects[:limit]
+    
+    def get_by_key(self, key_upper: str) -> Optional[dict]:
+        return self._by_key.get(key_upper)
+    
+    def get_by_name(self, name_lower: str) -> list[dict]:
+        return self._by_name.get(name_lower, [])
+    
+    def search_names(self, query_lower: str) -> list[dict]:
+        """Projects whose name contains the query or is contained in it."""
+        return [
+            p for p in self._projects
+            if query_lower in p["name"].lower() or p["name"].lower() in query_lower
+        ]
+
 
 class ActiveProjectsCache:
     """
     Cache active projects at startup to avoid repeated API calls.
     Provides exact and fuzzy matching for project verification.
+    
+    Projects come from `sources` (see scripts/project_sources.py; TCM only
+    by default), fetched concurrently and merged with per-project provenance.
+    Alternatively, attach() serves a snapshot another process publishes
+    (see scripts/shared_snapshot.py) instead of fetching in this process.
     """
     
-    def __init__(self):
-        self._projects: list[dict] = []
-        self._names_lower: set[str] = set()
-        self._keys: set[str] = set()
-        self._loaded: bool = False
+    def __init__(self, sources: Optional[list] = None):
+        self.sources = sources
+        self.source_errors: dict[str, Exception] = {}
+        self._snapshot = _MemorySnapshot([], generation=0)
     
     def load(self) -> int:
         """
-        Fetch active projects from TCM and cache.
+        Fetch active projects from every source and cache the merged list.
+        Sources that fail or time out are skipped and recorded in source_errors;
+        raises the first error if no source succeeded.
         Returns the number of projects loaded.
         """
-        from scripts.get_active_projects import get_active_projects_from_tcm
+        from scripts.project_sources import TCMSource, fetch_all, merge_projects
         
-        self._projects = get_active_projects_from_tcm()
-        self._names_lower = {p["name"].lower() for p in self._projects}
-        self._keys = {p["key"].upper() for p in self._projects}
-        self._loaded = True
+        sources = self.sources if self.sources is not None else [TCMSource()]
+        if not sources:
+            raise ValueError("No active project sources configured")
         
-        return len(self._projects)
+        with tracer.span("active projects load", cat="cache", sources=[s.name for s in sources]):
+            results, errors = fetch_all(sources)
+        self.source_errors = errors
+        if not results:
+            raise next(iter(errors.values()))
+        
+        return self.load_projects(merge_projects(results))
+    
+    def load_projects(self, projects: list[dict]) -> int:
+        """
+        Replace the cached snapshot with an already-fetched project list and index it.
+        Returns the number of projects loaded.
+        """
+        self._snapshot = _MemorySnapshot(projects, generation=self._snapshot.generation + 1)
+        return len(projects)
+    
+    def attach(self, path: str, check_interval: float = None) -> int:
+        """
+        Serve lookups from the shared snapshot file a refresher process publishes,
+        switching to new generations as they appear. Nothing is fetched here.
+        Returns the number of projects in the current generation (0 if none yet).
+        """
+        from scripts.shared_snapshot import DEFAULT_CHECK_INTERVAL, SharedSnapshot
+        
+        self._snapshot = SharedSnapshot(path, check_interval or DEFAULT_CHECK_INTERVAL)
+        return self._snapshot.count()
     
     def is_loaded(self) -> bool:
         """Check if the cache has been loaded."""
-        return self._loaded
+        return self._snapshot.generation > 0
+    
+    def version(self) -> int:
+        """Return the snapshot version, bumped every time the cache is (re)loaded."""
+        return self._snapshot.generation
     
     def list_all(self) -> list[dict]:
         """Return all active projects."""
-        return self._projects
+        return self._snapshot.list_all()
     
     def count(self) -> int:
         """Return the number of cached projects."""
-        return len(self._projects)
+        return self._snapshot.count()
+    
+    def get_keys(self) -> list[str]:
+        """Return the TCM keys of all cached projects."""
+        return self._snapshot.keys()
+    
+    def get_names(self) -> list[str]:
+        """Return the names of all cached projects."""
+        return self._snapshot.names()
     
     def get_sample_names(self, limit: int = 10) -> list[str]:
         """Return a sample of project names for prompt summaries."""
-        return [p["name"] for p in self._projects[:limit]]
+        return [p["name"] for p in self._snapshot.sample(limit)]
     
     def is_active(self, query: str) -> dict:
         """
         Check if a project name or key is active.
+        Records the lookup outcome (hit/partial/miss) in the metrics registry.
         
         Args:
             query: Project name or TCM key to check
@@ -62,6 +154,19 @@ class ActiveProjectsCache:
                 - matches: list[dict] - matching projects
                 - message: str - human-readable result
         """
+        with tracer.span("cache lookup", cat="cache", query=query):
+            result = self._lookup(query)
+        if result["exact_match"]:
+            outcome = "hit"
+        elif result["active"]:
+            outcome = "partial"
+        else:
+            outcome = "miss"
+        metrics.inc("cache_lookups_total", cache="active_projects", result=outcome)
+        return result
+    
+    def _lookup(self, query: str) -> dict:
+        """Match a project name or key against the cache (see is_active)."""
         if not query:
             return {
                 "active": False,
@@ -75,8 +180,9 @@ class ActiveProjectsCache:
         query_upper = query_stripped.upper()
         
         # Exact key match (e.g., "TCM-27829")
-        if query_upper in self._keys:
-            match = next(p for p in self._projects if p["key"].upper() == query_upper)
+        snapshot = self._snapshot
+        match = snapshot.get_by_key(query_upper)
+        if match is not None:
             return {
                 "active": True,
                 "exact_match": True,
@@ -85,7 +191,7 @@ class ActiveProjectsCache:
             }
         
         # Exact name match (case-insensitive)
-        exact_name_matches = [p for p in self._projects if p["name"].lower() == query_lower]
+        exact_name_matches = snapshot.get_by_name(query_lower)
         if exact_name_matches:
             matches_str = ", ".join(f"{m['key']}: {m['name']}" for m in exact_name_matches)
             return {
@@ -96,10 +202,7 @@ class ActiveProjectsCache:
             }
         
         # Partial/fuzzy match (name contains query or query contains name)
-        partial_matches = [
-            p for p in self._projects
-            if query_lower in p["name"].lower() or p["name"].lower() in query_lower
-        ]
+        partial_matches = snapshot.search_names(query_lower)
         if partial_matches:
             matches_str = ", ".join(f"{m['key']}: {m['name']}" for m in partial_matches)
             return {
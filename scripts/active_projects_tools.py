@@ -66,8 +66,12 @@ async def handle_list_active_projects(args: dict) -> dict:
             }]
         }
     
-    # Format for readability
-    formatted_lines = [f"  - {p['key']}: {p['name']}" for p in projects]
+    # Format for readability, with provenance when more than one source is configured
+    show_sources = len({source for p in projects for source in p.get("sources", [])}) > 1
+    formatted_lines = [
+        f"  - {p['key']}: {p['name']}" + (f" [{', '.join(p['sources'])}]" if show_sources else "")
+        for p in projects
+    ]
     output = f"Active Projects ({len(projects)} total):\n" + "\n".join(formatted_lines)
     
     return {
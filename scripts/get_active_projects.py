@@ -3,11 +3,19 @@ Fetch active projects from TSG Capacity Management Tool
 """
 
 import os
+import sys
 import base64
-import requests
 import json
 from dotenv import load_dotenv
 
+# Add project root to path when run directly (python scripts/get_active_projects.py)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.metrics import metrics
+from scripts.tracing import tracer
+from scripts.transport import TransportResponse, get_default_transport
+
 load_dotenv()
 
 JIRA_BASE_URL = os.environ.get("JIRA_BASE_URL", "https://yorkb2e.atlassian.net")
@@ -15,6 +23,18 @@ JIRA_EMAIL = os.environ.get("JIRA_EMAIL")
 JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
 TCM_PROJECT_KEY = "TCM"
 
+
+def _post_jira_search(url: str, headers: dict, payload: dict) -> TransportResponse:
+    """POST a JQL search, recording latency and payload sizes for the Jira upstream."""
+    with metrics.timed("upstream", upstream="jira", operation="search"), \
+            tracer.span("jira http search", cat="http"):
+        resp = get_default_transport().post(url, headers=headers, json=payload)
+        resp.raise_for_status()
+    metrics.inc("upstream_request_bytes_total", len(resp.request.body or b""), upstream="jira")
+    metrics.inc("upstream_response_bytes_total", len(resp.content), upstream="jira")
+    return resp
+
+
 def get_active_projects_from_tcm(
     jira_base_url: str = None,
     jira_email: str = None,
@@ -25,6 +45,7 @@ def get_active_projects_from_tcm(
     """
     Return active projects and clients from the TCM Jira project.
     Only includes issuetypes "Client" and "Project" (excludes Candidate, operations, etc.).
+    Follows pagination, fetching max_results issues per page.
 
     Returns list of {"key": "TCM-xxxx", "name": "Project Name"}.
     """
@@ -42,21 +63,31 @@ def get_active_projects_from_tcm(
         "Content-Type": "application/json",
         "Authorization": f"Basic {auth_str}",
     }
-    payload = {
-        "jql": f'project = {project_key} AND issuetype in ("Client", "Project")',
-        "maxResults": max_results,
-        "fields": ["summary"],
-    }
+    out = []
+    next_page_token = None
 
-    resp = requests.post(url, headers=headers, json=payload)
-    resp.raise_for_status()
-    data = resp.json()
+    while True:
+        payload = {
+            "jql": f'project = {project_key} AND issuetype in ("Client", "Project")',
+            "maxResults": max_results,
+            "fields": ["summary"],
+        }
+        if next_page_token is not None:
+            payload["nextPageToken"] = next_page_token
 
-    out = []
-    for issue in data.get("issues", []):
-        key = issue.get("key")
-        summary = (issue.get("fields") or {}).get("summary") or key
-        out.append({"key": key, "name": summary})
+        resp = _post_jira_search(url, headers, payload)
+        data = resp.json()
+
+        for issue in data.get("issues", []):
+            key = issue.get("key")
+            summary = (issue.get("fields") or {}).get("summary") or key
+            out.append({"key": key, "name": summary})
+
+        if data.get("isLast", True):
+            break
+        next_page_token = data.get("nextPageToken")
+        if not next_page_token:
+            break
     return out
 
 
@@ -109,8 +140,7 @@ def fetch_all_tcm_data_to_file(
         if next_page_token is not None:
             payload["nextPageToken"] = next_page_token
 
-        resp = requests.post(url, headers=headers, json=payload)
-        resp.raise_for_status()
+        resp = _post_jira_search(url, headers, payload)
         data = resp.json()
 
         for issue in data.get("issues", []):
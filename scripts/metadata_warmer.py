@@ -0,0 +1,228 @@
+"""
+Metadata Warmer - Prefetches CData catalog/schema/table/column metadata in
+the background so the agent's discovery calls (getCatalogs -> getSchemas ->
+getTables -> getColumns) are answered locally instead of with serial
+round trips to CData.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from scripts.metrics import metrics
+from scripts.tracing import tracer
+
+METADATA_TOOLS = ("getCatalogs", "getSchemas", "getTables", "getColumns")
+
+DEFAULT_WARM_CONCURRENCY = 4
+DEFAULT_MAX_TABLES = 200
+
+# Column that names the child objects in each tool's result, in order of preference
+# (CData sys_* tables first, then INFORMATION_SCHEMA style)
+_NAME_COLUMNS = {
+    "getCatalogs": ("CatalogName", "TABLE_CATALOG", "Catalog"),
+    "getSchemas": ("SchemaName", "TABLE_SCHEMA", "Schema"),
+    "getTables": ("TableName", "TABLE_NAME", "Table"),
+}
+
+# Tool that lists the children of each level, and the argument that names the parent
+_CHILD_CALLS = {
+    "getCatalogs": ("getSchemas", "catalogName"),
+    "getSchemas": ("getTables", "schemaName"),
+    "getTables": ("getColumns", "tableName"),
+}
+
+
+def _rows(text: str) -> list:
+    """Parse a tool result's text as JSON rows (list of dicts, or a results/rows wrapper) or CSV."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return list(csv.DictReader(io.StringIO(text)))
+
+    if isinstance(data, dict):
+        # {"results": [{"schema": [{"columnName": ...}], "rows": [[...]]}]} style
+        for result in data.get("results") or [data]:
+            columns = [c.get("columnName") or c.get("name") for c in result.get("schema") or []]
+            if columns and isinstance(result.get("rows"), list):
+                return [dict(zip(columns, row)) for row in result["rows"]]
+        return []
+    return data if isinstance(data, list) else []
+
+
+def extract_names(tool_name: str, result: dict) -> list[str]:
+    """
+    Return the catalog/schema/table names listed in a metadata tool result.
+    Unrecognized result formats yield no names (nothing below them is warmed).
+    """
+    candidates = [c.lower() for c in _NAME_COLUMNS.get(tool_name, ())]
+    names = []
+    for content in result.get("content") or []:
+        for row in _rows(content.get("text") or ""):
+            if not isinstance(row, dict):
+                continue
+            lowered = {str(k).lower(): v for k, v in row.items()}
+            value = next((lowered[c] for c in candidates if c in lowered), None)
+            if value and value not in names:
+                names.append(value)
+    return names
+
+
+def _key(tool_name: str, args: dict) -> tuple[str, str]:
+    return tool_name, json.dumps(args, sort_keys=True)
+
+
+class MetadataStore:
+    """Thread-safe store of metadata tool results, keyed by tool name and arguments."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: dict[tuple[str, str], dict] = {}
+
+    def get(self, tool_name: str, args: dict) -> Optional[dict]:
+        with self._lock:
+            return self._results.get(_key(tool_name, args))
+
+    def put(self, tool_name: str, args: dict, result: dict) -> None:
+        with self._lock:
+            self._results[_key(tool_name, args)] = result
+
+    def count(self, tool_name: str = None) -> int:
+        """Number of stored results (optionally for one tool)."""
+        with self._lock:
+            return sum(1 for name, _ in self._results if tool_name in (None, name))
+
+
+class MetadataWarmer:
+    """
+    Walks catalogs -> schemas -> tables -> columns on a bounded thread pool,
+    storing every result in a MetadataStore.
+
+    call() is what tool handlers use: stored results are returned immediately,
+    calls the warmer is already running are shared, and anything else (including
+    warm calls still queued behind others) is fetched directly so a user's
+    question never waits in the warm-up queue.
+    """
+
+    def __init__(
+        self,
+        call_tool: Callable[[str, dict], dict],
+        store: Optional[MetadataStore] = None,
+        concurrency: int = DEFAULT_WARM_CONCURRENCY,
+        max_tables: int = DEFAULT_MAX_TABLES,
+        catalogs: Optional[list[str]] = None,
+    ):
+        """
+        Args:
+            call_tool: Blocking CData tool call, e.g. MCPClient.call_tool
+            store: Where results are kept (a new MetadataStore by default)
+            concurrency: Most metadata calls in flight at once while warming
+            max_tables: Most tables to fetch columns for
+            catalogs: Only warm these catalogs (all of them by default)
+        """
+        self.call_tool = call_tool
+        self.store = store or MetadataStore()
+        self.concurrency = concurrency
+        self.max_tables = max_tables
+        self.catalogs = catalogs
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._tables_queued = 0
+        self._pending = 0
+        self._done = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """Start warming in the background (returns immediately)."""
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="metadata-warmer")
+        self._submit("getCatalogs", {})
+
+    def stop(self) -> None:
+        """Cancel queued warm calls; calls already running are left to finish."""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._done.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until warming finishes. Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def _submit(self, tool_name: str, args: dict) -> None:
+        key = _key(tool_name, args)
+        with self._lock:
+            if key in self._inflight or self.store.get(tool_name, args) is not None:
+                return
+            try:
+                future = self._executor.submit(self._fetch, tool_name, args)
+            except RuntimeError:  # Stopped
+                return
+            self._inflight[key] = future
+            self._pending += 1
+        future.add_done_callback(lambda f: self._finished(key, f))
+
+    def _finished(self, key: tuple[str, str], future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._pending -= 1
+            if self._pending == 0:
+                self._done.set()
+
+    def _fetch(self, tool_name: str, args: dict) -> dict:
+        """Call a metadata tool, store a successful result and queue its children."""
+        with metrics.timed("metadata_fetch", tool=tool_name), \
+                tracer.span(f"metadata {tool_name}", cat="warmer", args=args):
+            result = self.call_tool(tool_name, args)
+        if result.get("isError"):
+            metrics.inc("metadata_fetch_errors_total", tool=tool_name)
+            return result
+        self.store.put(tool_name, args, result)
+        if self._executor is not None:
+            self._queue_children(tool_name, args, result)
+        return result
+
+    def _queue_children(self, tool_name: str, args: dict, result: dict) -> None:
+        child = _CHILD_CALLS.get(tool_name)
+        if not child:
+            return
+        child_tool, arg_name = child
+        for name in extract_names(tool_name, result):
+            if tool_name == "getCatalogs" and self.catalogs is not None and name not in self.catalogs:
+                continue
+            if child_tool == "getColumns":
+                with self._lock:
+                    if self._tables_queued >= self.max_tables:
+                        return
+                    self._tables_queued += 1
+            self._submit(child_tool, {**args, arg_name: name})
+
+    async def call(self, tool_name: str, args: dict) -> dict:
+        """Answer a metadata tool call from the store, an in-flight warm call, or CData."""
+        result = self.store.get(tool_name, args)
+        if result is not None:
+            metrics.inc("cache_lookups_total", cache="metadata", result="hit")
+            return result
+
+        with self._lock:
+            future = self._inflight.get(_key(tool_name, args))
+        # cancel() only succeeds for calls still queued - running ones are shared
+        if future is not None and not future.cancel():
+            metrics.inc("cache_lookups_total", cache="metadata", result="inflight")
+            return await asyncio.wrap_future(future)
+
+        metrics.inc("cache_lookups_total", cache="metadata", result="miss")
+        # Counted as pending: it may queue children, and a cancelled warm call
+        # it replaces must not let wait() return before they are queued
+        with self._lock:
+            self._pending += 1
+            self._done.clear()
+        try:
+            return await asyncio.to_thread(self._fetch, tool_name, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._done.set()
@@ -0,0 +1,298 @@
+"""
+Metrics - In-process metrics registry for tool calls, upstream APIs and caches.
+Records latency histograms, byte counts, error counts and cache hit rates,
+and exports them as Prometheus text, JSON, or a human-readable /stats summary.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Sub-buckets per power of two. 128 keeps every recorded value within ~1% of
+# its true value (HDR-style log-linear bucketing) while staying small and sparse.
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT // 2
+
+# Quantiles reported by the exporters
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _bucket_index(value: int) -> int:
+    """Map a non-negative integer (microseconds) to its log-linear bucket."""
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return _SUB_BUCKET_COUNT + (shift - 1) * _SUB_BUCKET_HALF + ((value >> shift) - _SUB_BUCKET_HALF)
+
+
+def _bucket_midpoint(index: int) -> float:
+    """Return the value at the middle of a bucket (inverse of _bucket_index)."""
+    if index < _SUB_BUCKET_COUNT:
+        return float(index)
+    offset = index - _SUB_BUCKET_COUNT
+    shift = offset // _SUB_BUCKET_HALF + 1
+    mantissa = offset % _SUB_BUCKET_HALF + _SUB_BUCKET_HALF
+    lower = mantissa << shift
+    return lower + ((1 << shift) - 1) / 2
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with HDR-style log-linear buckets.
+    Values are recorded in seconds and stored at microsecond resolution.
+    """
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.min: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one observation."""
+        seconds = max(0.0, seconds)
+        index = _bucket_index(int(seconds * 1_000_000))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        if self.count == 0 or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Return the value (seconds) at quantile q (0-1)."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                value = _bucket_midpoint(index) / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            **{f"p{int(q * 100)}": self.quantile(q) for q in QUANTILES},
+        }
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(label_key: tuple, extra: dict = None) -> str:
+    items = list(label_key) + sorted((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(str(v))}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters and latency histograms, keyed by
+    metric name and labels (e.g. tool="queryData", upstream="cdata").
+    """
+
+    def __init__(self, prefix: str = "assistant"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, LatencyHistogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increment a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record a latency observation (seconds)."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def timed(self, kind: str, **labels):
+        """
+        Time a block of code.
+        Records {kind}_latency_seconds and {kind}_calls_total, plus
+        {kind}_errors_total if the block raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc(f"{kind}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(f"{kind}_latency_seconds", time.perf_counter() - start, **labels)
+            self.inc(f"{kind}_calls_total", **labels)
+
+    def get_counter(self, name: str, **labels) -> float:
+        """Return the current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **h.to_dict()} for key, h in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} summary")
+                for key, h in sorted(self._histograms[name].items()):
+                    for q in QUANTILES:
+                        lines.append(f"{full_name}{_format_labels(key, {'quantile': str(q)})} {h.quantile(q):.6f}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {h.sum:.6f}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def format_stats(self) -> str:
+        """Render a short human-readable summary (used by the /stats command)."""
+        snap = self.snapshot()
+        lines = []
+
+        for name, series in sorted(snap["histograms"].items()):
+            lines.append(f"{name}:")
+            for s in sorted(series, key=lambda s: -s["sum"]):
+                label_str = ", ".join(f"{k}={v}" for k, v in s["labels"].items())
+                lines.append(
+                    f"  {label_str or '(all)'}: n={s['count']} "
+                    f"p50={s['p50'] * 1000:.1f}ms p90={s['p90'] * 1000:.1f}ms "
+                    f"p99={s['p99'] * 1000:.1f}ms max={s['max'] * 1000:.1f}ms"
+                )
+
+        # Cache hit rates from cache_lookups_total{cache, result}
+        lookups: dict[str, dict[str, float]] = {}
+        for s in snap["counters"].get("cache_lookups_total", []):
+            cache = s["labels"].get("cache", "")
+            lookups.setdefault(cache, {})[s["labels"].get("result", "")] = s["value"]
+        for cache, results in sorted(lookups.items()):
+            total = sum(results.values())
+            hits = total - results.get("miss", 0)
+            lines.append(f"cache {cache}: {hits:g}/{total:g} hits ({hits / total:.0%})")
+
+        for name, series in sorted(snap["counters"].items()):
+            if name == "cache_lookups_total" or name.endswith("_calls_total"):
+                continue
+            for s in series:
+                label_str = ", ".join(f"{k}={v}" for k, v in s["labels"].items())
+                lines.append(f"{name}{{{label_str}}}: {_format_value(s['value'])}")
+
+        return "\n".join(lines) if lines else "No metrics recorded yet."
+
+
+# Global registry instance - import this in other modules
+metrics = MetricsRegistry()
+
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = None):
+    """
+    Serve metrics on a background thread.
+    GET /metrics returns Prometheus text, GET /metrics.json returns JSON.
+    Returns the running http.server.ThreadingHTTPServer.
+    """
+    # Deferred: http.server is only needed when the endpoint is enabled
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = registry.to_prometheus().encode()
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body = json.dumps(registry.snapshot()).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the chat output
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_json(path: str, registry: MetricsRegistry = None) -> None:
+    """Write a metrics snapshot to path atomically (temp file + rename)."""
+    registry = registry or metrics
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(registry.snapshot(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def start_json_exporter(path: str, interval: float = 30.0, registry: MetricsRegistry = None) -> threading.Thread:
+    """Write a metrics snapshot to path every `interval` seconds on a background thread."""
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                write_json(path, registry)
+            except OSError as e:
+                print(f"Warning: Could not write metrics to {path}: {e}")
+
+    thread = threading.Thread(target=run, name="metrics-json", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,204 @@
+"""
+Project Sources - Pluggable providers for the active projects list.
+TCM (Jira) is the default source; a local CSV file or SQLite database
+(e.g. an export of a central sheet) can be added alongside it. All sources
+are fetched concurrently, each with its own timeout, and merged into one
+deduplicated list that records which sources reported each project.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from scripts.metrics import metrics
+from scripts.tracing import tracer
+
+DEFAULT_TCM_TIMEOUT = 120.0  # Paginated crawl of every Client/Project issue
+DEFAULT_LOCAL_TIMEOUT = 5.0
+DEFAULT_SQLITE_QUERY = "SELECT key, name FROM active_projects"
+
+
+class SourceTimeout(TimeoutError):
+    """Raised (and recorded as the source's error) when a source misses its deadline."""
+
+
+class ProjectSource:
+    """
+    Base source: fetch() returns a list of {"key": ..., "name": ...} dicts.
+    fetch() may block; fetch_all() runs every source on its own thread.
+    """
+
+    name = "source"
+
+    def __init__(self, timeout: float = DEFAULT_LOCAL_TIMEOUT):
+        self.timeout = timeout
+
+    def fetch(self) -> list[dict]:
+        raise NotImplementedError
+
+
+class TCMSource(ProjectSource):
+    """Active Client/Project issues from the TCM Jira project."""
+
+    name = "tcm"
+
+    def __init__(self, timeout: float = DEFAULT_TCM_TIMEOUT):
+        super().__init__(timeout)
+
+    def fetch(self) -> list[dict]:
+        from scripts.get_active_projects import get_active_projects_from_tcm
+        return get_active_projects_from_tcm()
+
+
+class CSVSource(ProjectSource):
+    """
+    Projects from a CSV file with "key" and "name" columns.
+    Rows with an "active" column set to false/no/0 are skipped.
+    """
+
+    name = "csv"
+
+    def __init__(self, path: str, timeout: float = DEFAULT_LOCAL_TIMEOUT):
+        super().__init__(timeout)
+        self.path = path
+
+    def fetch(self) -> list[dict]:
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        return [
+            {"key": (row.get("key") or "").strip(), "name": (row.get("name") or "").strip()}
+            for row in rows
+            if (row.get("active") or "true").strip().lower() not in ("false", "no", "0")
+        ]
+
+
+class SQLiteSource(ProjectSource):
+    """Projects from a SQLite database; query must return (key, name) rows."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, query: str = DEFAULT_SQLITE_QUERY, timeout: float = DEFAULT_LOCAL_TIMEOUT):
+        super().__init__(timeout)
+        self.path = path
+        self.query = query
+
+    def fetch(self) -> list[dict]:
+        # Read-only, so a missing file is an error instead of a new empty database
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(self.query).fetchall()
+        finally:
+            conn.close()
+        return [{"key": str(key or "").strip(), "name": str(name or "").strip()} for key, name in rows]
+
+
+def fetch_all(sources: list[ProjectSource]) -> tuple[list[tuple[str, list[dict]]], dict[str, Exception]]:
+    """
+    Fetch every source concurrently.
+    Each source gets its own deadline (its timeout, counted from the common
+    start), so total wall time is the slowest source's, not the sum.
+    A source that errors or misses its deadline is left out.
+
+    Returns:
+        (results, errors) - results is [(source name, projects)] in source
+        order for the sources that succeeded; errors maps source name -> exception
+    """
+    outcomes: dict[int, tuple[str, object]] = {}
+
+    def run(index: int, source: ProjectSource) -> None:
+        try:
+            with metrics.timed("source", source=source.name), \
+                    tracer.span(f"source fetch {source.name}", cat="source"):
+                outcomes[index] = ("ok", source.fetch())
+        except Exception as e:
+            outcomes[index] = ("error", e)
+
+    # Daemon threads - a hung upstream call must not block interpreter exit
+    start = time.monotonic()
+    threads = []
+    for index, source in enumerate(sources):
+        thread = threading.Thread(target=run, args=(index, source), name=f"source-{source.name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    results, errors = [], {}
+    for index, (source, thread) in enumerate(zip(sources, threads)):
+        thread.join(max(0.0, start + source.timeout - time.monotonic()))
+        status, value = outcomes.get(index, ("timeout", None))
+        if status == "ok":
+            results.append((source.name, value))
+            continue
+        if status == "timeout":
+            value = SourceTimeout(f"{source.name} did not respond within {source.timeout:g}s")
+        errors[source.name] = value
+        metrics.inc("source_errors_total", source=source.name, reason=status)
+    return results, errors
+
+
+def merge_projects(results: list[tuple[str, list[dict]]]) -> list[dict]:
+    """
+    Merge per-source project lists into one deduplicated list.
+
+    Projects are the same if their keys match (key.upper()); otherwise a
+    row matches an existing project from another source by name
+    (name.lower(), as the cache and snapshot indexes normalize), so a CSV
+    row with its own key still merges into the TCM project of that name.
+    Distinct keys within one source stay distinct projects. Earlier
+    sources win for key and name. Each project gets a "sources" list
+    (provenance). Rows without a key that match nothing are keyed by their
+    name.
+    """
+    merged: list[dict] = []
+    by_key: dict[str, dict] = {}
+    by_name: dict[str, dict] = {}
+
+    for source_name, projects in results:
+        for p in projects:
+            key = (p.get("key") or "").strip()
+            name = (p.get("name") or "").strip() or key
+            if not name:
+                continue
+            existing = by_key.get(key.upper()) if key else None
+            if existing is None:
+                existing = by_name.get(name.lower())
+                if existing is not None and key and source_name in existing["sources"]:
+                    existing = None  # Same source, different key: a separate project
+            if existing is not None:
+                if source_name not in existing["sources"]:
+                    existing["sources"].append(source_name)
+                if key:
+                    by_key.setdefault(key.upper(), existing)
+                continue
+
+            project = {"key": key or name, "name": name, "sources": [source_name]}
+            merged.append(project)
+            by_key.setdefault(project["key"].upper(), project)
+            by_name.setdefault(name.lower(), project)
+    return merged
+
+
+def sources_from_env() -> list[ProjectSource]:
+    """
+    Build the source list: TCM unless PROJECT_SOURCE_TCM=false, plus
+    PROJECT_SOURCE_CSV and/or PROJECT_SOURCE_SQLITE paths when set.
+    PROJECT_SOURCE_TIMEOUT overrides the per-source timeout (seconds).
+    """
+    timeout: Optional[float] = None
+    if os.environ.get("PROJECT_SOURCE_TIMEOUT"):
+        timeout = float(os.environ["PROJECT_SOURCE_TIMEOUT"])
+
+    sources: list[ProjectSource] = []
+    if os.environ.get("PROJECT_SOURCE_TCM", "true").lower() in ("1", "true", "yes"):
+        sources.append(TCMSource(timeout or DEFAULT_TCM_TIMEOUT))
+    if os.environ.get("PROJECT_SOURCE_CSV"):
+        sources.append(CSVSource(os.environ["PROJECT_SOURCE_CSV"], timeout or DEFAULT_LOCAL_TIMEOUT))
+    if os.environ.get("PROJECT_SOURCE_SQLITE"):
+        sources.append(SQLiteSource(
+            os.environ["PROJECT_SOURCE_SQLITE"],
+            os.environ.get("PROJECT_SOURCE_SQLITE_QUERY", DEFAULT_SQLITE_QUERY),
+            timeout or DEFAULT_LOCAL_TIMEOUT,
+        ))
+    return sources
@@ -0,0 +1,77 @@
+"""
+Prompt Manager - Picks the system prompt strategy for the current cache snapshot.
+Injects the full project list (simple prompt) when it fits the token budget,
+otherwise falls back to the summary + tools prompt (scalable prompt).
+"""
+
+from typing import Optional
+
+from scripts.active_projects_cache import ActiveProjectsCache, active_projects_cache
+from scripts.system_prompts import (
+    build_scalable_system_prompt,
+    build_simple_system_prompt,
+    format_project_list,
+    project_list_length,
+)
+
+# Most tokens the injected project list may add to every request
+DEFAULT_PROMPT_TOKEN_BUDGET = 2000
+
+STRATEGY_SIMPLE = "simple"
+STRATEGY_SCALABLE = "scalable"
+
+
+class PromptManager:
+    """
+    Builds the system prompt for the active projects cache.
+
+    The rendered prompt is memoized by cache snapshot version, so repeated
+    sessions reuse the same string until the cache is reloaded.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ActiveProjectsCache] = None,
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+    ):
+        self.cache = cache or active_projects_cache
+        self.token_budget = token_budget
+        self._version: Optional[int] = None
+        self._strategy: str = STRATEGY_SCALABLE
+        self._list_tokens: int = 0
+        self._prompt: str = ""
+
+    def _render(self) -> None:
+        """Pick the strategy and render the prompt for the current snapshot."""
+        # Read first: if a new generation lands mid-render, the next call re-renders
+        version = self.cache.version()
+        # Works from keys and names only: project dicts are built just for a
+        # list small enough to inject, however large the snapshot is
+        keys, names = self.cache.get_keys(), self.cache.get_names()
+        # ~4 characters per token, as estimate_tokens()
+        self._list_tokens = (project_list_length(keys, names) + 3) // 4
+
+        if keys and self._list_tokens <= self.token_budget:
+            self._strategy = STRATEGY_SIMPLE
+            projects = [{"key": key, "name": name} for key, name in zip(keys, names)]
+            self._prompt = build_simple_system_prompt(projects, format_project_list(projects))
+        else:
+            self._strategy = STRATEGY_SCALABLE
+            self._prompt = build_scalable_system_prompt(len(keys), sorted(names, key=str.casefold)[:10])
+        self._version = version
+
+    def get_system_prompt(self) -> str:
+        """Return the system prompt, re-rendering only if the cache was reloaded."""
+        if self._version != self.cache.version():
+            self._render()
+        return self._prompt
+
+    def strategy(self) -> str:
+        """Return the strategy ("simple" or "scalable") of the current prompt."""
+        self.get_system_prompt()
+        return self._strategy
+
+    def estimate_list_tokens(self) -> int:
+        """Return the estimated token cost of injecting the full project list."""
+        self.get_system_prompt()
+        return self._list_tokens
@@ -0,0 +1,133 @@
+"""
+Query Scope - Pushes active-project predicates down into CData queryData SQL.
+Rewrites simple SELECTs against known project-bearing tables so CData only
+returns rows for active projects, instead of the agent filtering them itself.
+"""
+
+import re
+from typing import Optional
+
+# Name of the SQL argument on the CData queryData tool
+QUERY_ARG = "query"
+
+# (schema, table) (lowercase) -> (column to filter, "names" or "keys").
+# The schema is the CData connector's ([Jira1].[Jira].[Issues] -> "jira"), so
+# GitHub or other connectors' tables of the same name are never scoped, and
+# tables referenced without a schema are left alone.
+# "names" filters on active project/client names, "keys" on TCM keys.
+# Matching is exact (IN list), so only tables whose rows belong to one TCM
+# project belong here. Listings such as Jira Projects or Confluence Spaces are
+# deliberately left out: general questions like "What Jira projects exist?"
+# must see every row.
+PROJECT_SCOPED_TABLES = {
+    ("jira", "issues"): ("ProjectName", "names"),
+}
+
+# Skip the rewrite rather than send an unreasonably large IN list
+MAX_PREDICATE_VALUES = 1000
+
+_IDENT = r'(?:\[[^\]]+\]|"[^"]+"|`[^`]+`|\w+)'
+_FROM_RE = re.compile(
+    rf"\bFROM\s+(?P<table>{_IDENT}(?:\s*\.\s*{_IDENT})*)"
+    rf"(?:\s+(?:AS\s+)?(?P<alias>(?!(?:WHERE|GROUP|ORDER|HAVING|LIMIT|OFFSET|FETCH)\b)\w+))?",
+    re.IGNORECASE,
+)
+_WHERE_RE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+_CLAUSE_END_RE = re.compile(r"\b(?:GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|OFFSET|FETCH)\b", re.IGNORECASE)
+# What may follow the table reference - anything else (table hints like
+# WITH (NOLOCK), comma joins, ...) leaves the query unchanged
+_AFTER_TABLE_RE = re.compile(r"(?:WHERE|GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|OFFSET|FETCH)\b|$", re.IGNORECASE)
+# Constructs we don't try to rewrite - the query is passed through unchanged
+_UNSUPPORTED_RE = re.compile(r"\b(?:JOIN|UNION|INTERSECT|EXCEPT)\b|\(\s*SELECT\b", re.IGNORECASE)
+
+
+def _mask_literals(sql: str) -> str:
+    """
+    Blank out the contents of string literals (same length) so keyword
+    searches can't match text inside quotes.
+    """
+    return re.sub(r"'(?:[^']|'')*'", lambda m: "'" + "_" * (len(m.group(0)) - 2) + "'", sql)
+
+
+def _unquote(identifier: str) -> str:
+    if identifier[:1] in ('[', '"', '`'):
+        return identifier[1:-1]
+    return identifier
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def scope_query(
+    sql: str,
+    keys: list[str],
+    names: list[str],
+    tables: dict = None,
+) -> tuple[str, Optional[str], int]:
+    """
+    Inject an active-project predicate into a queryData SELECT.
+
+    Only single-table SELECTs against schema-qualified tables in
+    PROJECT_SCOPED_TABLES are rewritten; anything else (joins, unions,
+    subqueries, comments, table hints, unknown or unqualified tables) is
+    returned unchanged.
+
+    Args:
+        sql: SQL passed to queryData
+        keys: Active project TCM keys
+        names: Active project/client names
+        tables: Table mapping to use (defaults to PROJECT_SCOPED_TABLES)
+
+    Returns:
+        (sql, table, value_count) - the rewritten SQL, the table it was scoped
+        on ("schema.table") and how many values went into the IN list; the
+        original SQL, None and 0 if it was not rewritten
+    """
+    unchanged = (sql, None, 0)
+    tables = PROJECT_SCOPED_TABLES if tables is None else tables
+    stripped = sql.strip().rstrip(";").rstrip()
+    masked = _mask_literals(stripped)
+
+    if not re.match(r"SELECT\b", masked, re.IGNORECASE) or ";" in masked:
+        return unchanged
+    # A trailing -- comment would swallow the closing paren we add
+    if "--" in masked or "/*" in masked:
+        return unchanged
+
+    from_matches = list(_FROM_RE.finditer(masked))
+    if len(from_matches) != 1:
+        return unchanged
+    from_match = from_matches[0]
+    if _UNSUPPORTED_RE.search(masked) or not _AFTER_TABLE_RE.match(masked[from_match.end():].lstrip()):
+        return unchanged
+
+    table_parts = [_unquote(part).lower() for part in re.findall(_IDENT, from_match.group("table"))]
+    table_key = tuple(table_parts[-2:])
+    if len(table_key) != 2 or table_key not in tables:
+        return unchanged
+
+    column, source = tables[table_key]
+    values = keys if source == "keys" else names
+    values = sorted({v for v in values if v})
+    if not values or len(values) > MAX_PREDICATE_VALUES:
+        return unchanged
+
+    alias = from_match.group("alias")
+    qualified_column = f"{alias}.[{column}]" if alias else f"[{column}]"
+    predicate = f"{qualified_column} IN ({', '.join(_sql_literal(v) for v in values)})"
+
+    tail_start = from_match.end()
+    clause_end = _CLAUSE_END_RE.search(masked, tail_start)
+    end = clause_end.start() if clause_end else len(stripped)
+
+    where = _WHERE_RE.search(masked, tail_start, end)
+    if where:
+        condition = stripped[where.end():end].strip()
+        scoped = f"{stripped[:where.start()]}WHERE {predicate} AND ({condition})"
+    else:
+        scoped = f"{stripped[:end].rstrip()} WHERE {predicate}"
+
+    rest = stripped[end:].strip()
+    return (f"{scoped} {rest}" if rest else scoped), ".".join(table_key), len(values)
+
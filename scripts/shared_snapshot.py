@@ -0,0 +1,293 @@
+"""
+Shared Snapshot - Publishes the active projects list as an indexed,
+memory-mapped file that any number of worker processes can attach to.
+
+One refresher process fetches from the project sources and publishes; each
+publish writes a new file and atomically renames it over the old one with
+the generation counter bumped. Workers mmap the file and answer lookups by
+binary search directly over the mapped pages (shared through the OS page
+cache), so per-process memory stays flat and Jira sees one fetch per refresh
+however many workers there are. Workers notice a new generation by the
+file's inode changing and remap - no locks are shared between processes.
+
+Run the refresher with:
+    python -m scripts.shared_snapshot --path /dev/shm/active_projects.snap --interval 300
+
+Publishing relies on POSIX rename semantics (replacing a file other
+processes have mapped), so it isn't supported on Windows.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Iterator, Optional
+
+# Add project root to path when run directly (python scripts/shared_snapshot.py)
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SNAPSHOT_PATH = "scripts/output/active_projects.snap"
+DEFAULT_CHECK_INTERVAL = 1.0
+
+MAGIC = b"APSNAP01"
+
+# magic, generation, project count, offsets of the project table, key index and name index
+_HEADER = struct.Struct("<8sQIIII")
+# key, name and comma-joined sources as (offset, length) pairs into the string heap
+_PROJECT = struct.Struct("<IIIIII")
+# normalized string (offset, length) and project number, sorted by the string's bytes
+_INDEX_ENTRY = struct.Struct("<III")
+
+
+def serialize(projects: list[dict], generation: int) -> bytes:
+    """
+    Encode projects with a key index (key.upper()) and name index (name.lower()).
+
+    Layout: header | project table | key index | name index | string heap.
+    Offsets are absolute, so readers use struct.unpack_from on the mapping.
+    """
+    count = len(projects)
+    projects_offset = _HEADER.size
+    key_index_offset = projects_offset + count * _PROJECT.size
+    name_index_offset = key_index_offset + count * _INDEX_ENTRY.size
+    heap_offset = name_index_offset + count * _INDEX_ENTRY.size
+
+    heap = bytearray()
+
+    def add(text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")
+        position = heap_offset + len(heap)
+        heap.extend(data)
+        return position, len(data)
+
+    table = bytearray()
+    key_entries, name_entries = [], []
+    for number, p in enumerate(projects):
+        key, name = add(p["key"]), add(p["name"])
+        sources = add(",".join(p.get("sources", [])))
+        table += _PROJECT.pack(*key, *name, *sources)
+        key_entries.append((p["key"].upper().encode("utf-8"), number))
+        name_entries.append((p["name"].lower().encode("utf-8"), number))
+
+    indexes = bytearray()
+    for entries in (key_entries, name_entries):
+        for normalized, number in sorted(entries):
+            position = heap_offset + len(heap)
+            heap.extend(normalized)
+            indexes += _INDEX_ENTRY.pack(position, len(normalized), number)
+
+    header = _HEADER.pack(MAGIC, generation, count, projects_offset, key_index_offset, name_index_offset)
+    return header + table + indexes + heap
+
+
+def read_generation(path: str) -> int:
+    """Generation of the snapshot at path (0 if there is none or it isn't a snapshot)."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return 0
+    if len(header) < _HEADER.size or header[:len(MAGIC)] != MAGIC:
+        return 0
+    return _HEADER.unpack(header)[1]
+
+
+def publish_snapshot(projects: list[dict], path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """
+    Write a new generation of the snapshot and atomically replace the old one.
+    Only one process should publish to a path. Returns the new generation.
+    """
+    generation = read_generation(path) + 1
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(serialize(projects, generation))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return generation
+
+
+class _Mapping:
+    """One mapped generation of the snapshot file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.inode = (stat.st_dev, stat.st_ino)
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.generation, self.count, self.projects_offset, self.key_index_offset, self.name_index_offset = (
+            _HEADER.unpack_from(self.buffer, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an active projects snapshot")
+
+    def _string(self, offset: int, length: int) -> str:
+        return self.buffer[offset:offset + length].decode("utf-8")
+
+    def field(self, which: int) -> list[str]:
+        """
+        Every project's key (which=0) or name (which=1), in project order.
+        Only that string is decoded, and nothing is kept once the caller is
+        done with the list, so per-process memory stays flat.
+        """
+        values = []
+        for number in range(self.count):
+            entry = _PROJECT.unpack_from(self.buffer, self.projects_offset + number * _PROJECT.size)
+            values.append(self._string(entry[2 * which], entry[2 * which + 1]))
+        return values
+
+    def project(self, number: int) -> dict:
+        key_off, key_len, name_off, name_len, src_off, src_len = _PROJECT.unpack_from(
+            self.buffer, self.projects_offset + number * _PROJECT.size
+        )
+        sources = self._string(src_off, src_len)
+        return {
+            "key": self._string(key_off, key_len),
+            "name": self._string(name_off, name_len),
+            "sources": sources.split(",") if sources else [],
+        }
+
+    def _entry(self, index_offset: int, position: int) -> tuple[bytes, int]:
+        offset, length, number = _INDEX_ENTRY.unpack_from(self.buffer, index_offset + position * _INDEX_ENTRY.size)
+        return self.buffer[offset:offset + length], number
+
+    def find(self, index_offset: int, normalized: str) -> list[int]:
+        """Project numbers whose normalized key/name equals normalized (binary search)."""
+        target = normalized.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(index_offset, middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        numbers = []
+        while low < self.count:
+            value, number = self._entry(index_offset, low)
+            if value != target:
+                break
+            numbers.append(number)
+            low += 1
+        return sorted(numbers)
+
+    def names_lower(self) -> Iterator[tuple[str, int]]:
+        """(name.lower(), project number) for every project, in name order."""
+        for position in range(self.count):
+            value, number = self._entry(self.name_index_offset, position)
+            yield value.decode("utf-8"), number
+
+
+class SharedSnapshot:
+    """
+    Read side of the snapshot, used by ActiveProjectsCache.attach().
+    Lookups check (at most every check_interval seconds) whether a new
+    generation was published and switch to it; a missing file reads as an
+    empty generation 0 until the refresher publishes.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._mapping: Optional[_Mapping] = None
+        self._checked_at = 0.0
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> None:
+        """Switch to the newest published generation, if it changed."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if self._mapping is None or self._mapping.inode != (stat.st_dev, stat.st_ino):
+            # Readers still using the old mapping keep it alive until they're done
+            self._mapping = _Mapping(self.path)
+
+    def _current(self) -> Optional[_Mapping]:
+        self.refresh()
+        return self._mapping
+
+    @property
+    def generation(self) -> int:
+        mapping = self._current()
+        return mapping.generation if mapping else 0
+
+    def count(self) -> int:
+        mapping = self._current()
+        return mapping.count if mapping else 0
+
+    def list_all(self) -> list[dict]:
+        mapping = self._current()
+        return [mapping.project(n) for n in range(mapping.count)] if mapping else []
+
+    def keys(self) -> list[str]:
+        mapping = self._current()
+        return mapping.field(0) if mapping else []
+
+    def names(self) -> list[str]:
+        mapping = self._current()
+        return mapping.field(1) if mapping else []
+
+    def sample(self, limit: int) -> list[dict]:
+        mapping = self._current()
+        return [mapping.project(n) for n in range(min(limit, mapping.count))] if mapping else []
+
+    def get_by_key(self, key_upper: str) -> Optional[dict]:
+        mapping = self._current()
+        numbers = mapping.find(mapping.key_index_offset, key_upper) if mapping else []
+        return mapping.project(numbers[0]) if numbers else None
+
+    def get_by_name(self, name_lower: str) -> list[dict]:
+        mapping = self._current()
+        if not mapping:
+            return []
+        return [mapping.project(n) for n in mapping.find(mapping.name_index_offset, name_lower)]
+
+    def search_names(self, query_lower: str) -> list[dict]:
+        mapping = self._current()
+        if not mapping:
+            return []
+        numbers = sorted(n for name, n in mapping.names_lower() if query_lower in name or name in query_lower)
+        return [mapping.project(n) for n in numbers]
+
+
+def main() -> None:
+    """Refresher: load the project sources and publish a new generation every interval."""
+    import argparse
+
+    from scripts.active_projects_cache import ActiveProjectsCache
+    from scripts.project_sources import sources_from_env
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=os.environ.get("PROJECTS_SNAPSHOT", DEFAULT_SNAPSHOT_PATH))
+    parser.add_argument("--interval", type=float, default=300.0, help="seconds between refreshes")
+    parser.add_argument("--once", action="store_true", help="publish one generation and exit")
+    args = parser.parse_args()
+
+    cache = ActiveProjectsCache(sources=sources_from_env())
+    while True:
+        try:
+            count = cache.load()
+            generation = publish_snapshot(cache.list_all(), args.path)
+            for source_name, error in cache.source_errors.items():
+                print(f"Warning: Skipped project source {source_name}: {error}")
+            print(f"Published generation {generation} ({count} projects) to {args.path}", flush=True)
+        except Exception as e:
+            if args.once:
+                raise
+            print(f"Warning: Refresh failed, keeping the previous generation: {e}", flush=True)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,33 +4,26 @@ Supports both simple (prompt injection) and scalable (tool-based) approaches.
 """
 
 
-def build_scalable_system_prompt(project_count: int, sample_names: list[str]) -> str:
-    """
-    Build a system prompt with summary + tool instructions.
-    Does NOT include the full project list (that's available via tools).
-    
-    This is the SCALABLE approach - works for 100+ projects.
-    
-    Args:
-        project_count: Number of active projects
-        sample_names: Sample of project/client names to show in prompt
-        
-    Returns:
-        System prompt string
-    """
-    sample_str = ", ".join(sample_names[:10]) if sample_names else "None loaded"
-    
-    return f"""You are an internal assistant with **read-only access to Confluence, Jira, and GitHub** via CData Connect AI.
+# Static instructions come first and the project section last, so the
+# prompt prefix is byte-identical across sessions and project list changes
+# (upstream prompt caching matches on the longest identical prefix).
 
-## ACTIVE PROJECTS CONTEXT
+_PREAMBLE = "You are an internal assistant with **read-only access to Confluence, Jira, and GitHub** via CData Connect AI."
+
+_TCM_TOOLS = """For counts or searches across ALL TCM issues (candidates, operations, statuses), use the offline TCM tools:
+- `tcm_breakdown` - Counts TCM issues grouped by issuetype or status
+- `search_tcm_issues` - Searches TCM issues by summary text, issuetype, status or key"""
 
-There are currently **{project_count} active projects/clients** tracked in the TSG Capacity Management Tool (TCM).
-Example projects: {sample_str}
+_SCALABLE_PROMPT_PREFIX = f"""{_PREAMBLE}
+
+## TOOLS
 
 You have two special tools for working with active projects:
 - `list_active_projects` - Returns the full list of all active projects
 - `is_project_active` - Checks if a specific project/client name is active
 
+{_TCM_TOOLS}
+
 ## WORKFLOW RULES
 
 1. **Before querying Confluence, Jira, or GitHub for a specific project:**
@@ -60,59 +53,115 @@ You have two special tools for working with active projects:
 * If information is missing or unclear, explicitly state that
 * Do not output sensitive or personal data
 * You can only READ - you cannot write or modify anything
-* When answering about specific projects, confirm they are in the active projects list"""
-
+* When answering about specific projects, confirm they are in the active projects list
 
-def build_simple_system_prompt(active_projects: list[dict]) -> str:
-    """
-    Build a system prompt with the full project list injected.
-    
-    This is the SIMPLE approach - good for <50 projects.
-    
-    Args:
-        active_projects: List of {"key": "TCM-xxx", "name": "Project Name"}
-        
-    Returns:
-        System prompt string
-    """
-    if not active_projects:
-        projects_section = "No active projects loaded."
-    else:
-        projects_formatted = "\n".join(
-            f"  - {p['key']}: {p['name']}" for p in active_projects
-        )
-        projects_section = f"""The following {len(active_projects)} projects/clients are currently ACTIVE:
-
-{projects_formatted}"""
-
-    return f"""You are an internal assistant with **read-only access to Confluence, Jira, and GitHub** via CData Connect AI.
+## ACTIVE PROJECTS CONTEXT
 
-## ACTIVE PROJECTS (Source: TSG Capacity Management Tool)
+"""
 
-{projects_section}
+_SIMPLE_PROMPT_PREFIX = f"""{_PREAMBLE}
 
 ## SCOPE RULES
 
-1. **In-scope queries:** When a user asks about a project or client that IS in the active list above, proceed normally - query Confluence, Jira, or GitHub as needed and provide helpful information.
+1. **In-scope queries:** When a user asks about a project or client that IS in the active list below, proceed normally - query Confluence, Jira, or GitHub as needed and provide helpful information.
 
 2. **Out-of-scope queries:** When a user asks about a project or client that is NOT in the active list:
    - Politely inform them: "That project/client is not currently in our active projects list from the TSG Capacity Management Tool."
    - Do NOT query Confluence, Jira, or GitHub for that project.
    - Offer to help with one of the active projects instead.
 
-3. **Ambiguous queries:** If the user asks a general question (e.g., "What projects are active?" or "List all clients"), use the active projects list above to answer.
+3. **Ambiguous queries:** If the user asks a general question (e.g., "What projects are active?" or "List all clients"), use the active projects list below to answer.
 
 4. **Partial matches:** If the user mentions something that partially matches an active project (e.g., "Thrivent" matches multiple Thrivent projects), clarify which specific project they mean.
 
+{_TCM_TOOLS}
+
 ## RESPONSE GUIDELINES
 
 * Always summarize content instead of returning large raw text blocks
-* Indicate which data source information comes from (Confluence, Jira, GitHub)
+* Indicate which data source information comes from (Confluence, Jira, GitHub, TCM)
 * Structure responses with headings and bullet points
 * If information is missing or unclear, explicitly state that
 * Do not output sensitive or personal data
 * You can only READ - you cannot write or modify anything
-* When answering about projects, explicitly state that results are scoped to active projects"""
+* When answering about projects, explicitly state that results are scoped to active projects
+
+## ACTIVE PROJECTS (Source: TSG Capacity Management Tool)
+
+"""
+
+
+def build_scalable_system_prompt(project_count: int, sample_names: list[str]) -> str:
+    """
+    Build a system prompt with summary + tool instructions.
+    Does NOT include the full project list (that's available via tools).
+    
+    This is the SCALABLE approach - works for 100+ projects.
+    
+    Args:
+        project_count: Number of active projects
+        sample_names: Sample of project/client names to show in prompt
+        
+    Returns:
+        System prompt string
+    """
+    sample_str = ", ".join(sample_names[:10]) if sample_names else "None loaded"
+    
+    return (
+        f"{_SCALABLE_PROMPT_PREFIX}"
+        f"There are currently **{project_count} active projects/clients** tracked in the TSG Capacity Management Tool (TCM).\n"
+        f"Example projects: {sample_str}"
+    )
+
+
+_NO_PROJECTS = "No active projects loaded."
+
+
+def _project_list_header(count: int) -> str:
+    return f"The following {count} projects/clients are currently ACTIVE:\n\n"
+
+
+def format_project_list(active_projects: list[dict]) -> str:
+    """
+    Render the project section of the simple prompt.
+    Projects are sorted so the same set always renders to the same bytes.
+    """
+    if not active_projects:
+        return _NO_PROJECTS
+    
+    ordered = sorted(active_projects, key=lambda p: (p["name"].casefold(), p["key"]))
+    projects_formatted = "\n".join(f"  - {p['key']}: {p['name']}" for p in ordered)
+    return f"{_project_list_header(len(active_projects))}{projects_formatted}"
+
+
+def project_list_length(keys: list[str], names: list[str]) -> int:
+    """
+    Length in characters of format_project_list() for these projects (keys
+    and names in the same order), without building or rendering them.
+    """
+    if not keys:
+        return len(_NO_PROJECTS)
+    # "  - {key}: {name}" per project, newline-separated
+    lines = sum(len(key) + len(name) + 6 for key, name in zip(keys, names))
+    return len(_project_list_header(len(keys))) + lines + len(keys) - 1
+
+
+def build_simple_system_prompt(active_projects: list[dict], projects_section: str = None) -> str:
+    """
+    Build a system prompt with the full project list injected.
+    
+    This is the SIMPLE approach - good for <50 projects.
+    
+    Args:
+        active_projects: List of {"key": "TCM-xxx", "name": "Project Name"}
+        projects_section: Already rendered format_project_list() output, if the caller has it
+        
+    Returns:
+        System prompt string
+    """
+    if projects_section is None:
+        projects_section = format_project_list(active_projects)
+    return f"{_SIMPLE_PROMPT_PREFIX}{projects_section}"
 
 
 # Default legacy prompt (for fallback)
@@ -0,0 +1,203 @@
+"""
+TCM Store - Local indexed store over the full TCM dump.
+Loads the file written by fetch_all_tcm_data_to_file into SQLite so TCM
+analytics (breakdowns, searches, key lookups) run offline without Jira calls.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Optional
+
+DEFAULT_DUMP_PATH = "scripts/output/tcm_full_dump.json"
+
+# Columns that can be filtered on or grouped by
+GROUPABLE_FIELDS = ("issuetype", "status")
+
+
+def _fts5_available(conn: sqlite3.Connection) -> bool:
+    """Check whether this SQLite build supports FTS5."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _fts_match_expression(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Each word is quoted (so punctuation can't break the query) and prefix-matched.
+    """
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+
+class TCMStore:
+    """
+    SQLite-backed store of every TCM issue (key, summary, issuetype, status).
+    Indexed on key, issuetype and status, with full-text search on summary.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self._db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._has_fts: bool = False
+        self._loaded: bool = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load(self, path: str = DEFAULT_DUMP_PATH) -> int:
+        """
+        Load a TCM dump (JSON list of flattened issues) into the store.
+        Replaces any previously loaded data.
+        Returns the number of issues loaded.
+        """
+        with open(path) as f:
+            issues = json.load(f)
+        return self.load_issues(issues)
+
+    def load_issues(self, issues: list[dict]) -> int:
+        """
+        Load already-parsed issues into the store.
+        Returns the number of issues loaded.
+        """
+        # Keyed by issue key so a repeated key (e.g. overlapping pages) keeps the last copy
+        rows = list({
+            i["key"]: (i["key"], i.get("summary") or "", i.get("issuetype"), i.get("status"))
+            for i in issues
+            if i.get("key")
+        }.values())
+
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+                self._has_fts = _fts5_available(self._conn)
+            conn = self._conn
+
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS issues_fts")
+                conn.execute("DROP TABLE IF EXISTS issues")
+                conn.execute(
+                    "CREATE TABLE issues ("
+                    " id INTEGER PRIMARY KEY,"
+                    " key TEXT NOT NULL COLLATE NOCASE,"
+                    " summary TEXT NOT NULL,"
+                    " issuetype TEXT COLLATE NOCASE,"
+                    " status TEXT COLLATE NOCASE)"
+                )
+                conn.executemany(
+                    "INSERT INTO issues (key, summary, issuetype, status) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                # Columns are declared NOCASE so case-insensitive filters can use these indexes.
+                # Indexes are built after the bulk insert - much faster than maintaining them row by row
+                conn.execute("CREATE UNIQUE INDEX idx_issues_key ON issues (key)")
+                conn.execute("CREATE INDEX idx_issues_issuetype_status ON issues (issuetype, status)")
+                conn.execute("CREATE INDEX idx_issues_status ON issues (status)")
+                if self._has_fts:
+                    conn.execute(
+                        "CREATE VIRTUAL TABLE issues_fts USING fts5("
+                        "summary, content='issues', content_rowid='id')"
+                    )
+                    conn.execute("INSERT INTO issues_fts (rowid, summary) SELECT id, summary FROM issues")
+            self._loaded = True
+
+        return len(rows)
+
+    def is_loaded(self) -> bool:
+        """Check if a dump has been loaded."""
+        return self._loaded
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        if not self._loaded:
+            return []
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    @staticmethod
+    def _filters(issuetype: str = None, status: str = None) -> tuple[list[str], list]:
+        clauses, params = [], []
+        if issuetype:
+            clauses.append("issues.issuetype = ?")
+            params.append(issuetype)
+        if status:
+            clauses.append("issues.status = ?")
+            params.append(status)
+        return clauses, params
+
+    def count(self, issuetype: str = None, status: str = None) -> int:
+        """Return the number of issues, optionally filtered by issuetype and/or status."""
+        clauses, params = self._filters(issuetype, status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT COUNT(*) AS n FROM issues{where}", tuple(params))
+        return rows[0]["n"] if rows else 0
+
+    def breakdown(self, group_by: str = "issuetype", issuetype: str = None, status: str = None) -> list[dict]:
+        """
+        Count issues grouped by issuetype or status.
+
+        Returns:
+            list of {"value": str, "count": int}, largest groups first
+        """
+        if group_by not in GROUPABLE_FIELDS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUPABLE_FIELDS)}")
+        clauses, params = self._filters(issuetype, status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(
+            f"SELECT {group_by} AS value, COUNT(*) AS count FROM issues{where} "
+            f"GROUP BY {group_by} ORDER BY count DESC, value",
+            tuple(params),
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        """Look up a single issue by key (case-insensitive)."""
+        rows = self._query(
+            "SELECT key, summary, issuetype, status FROM issues WHERE key = ?",
+            (key.strip(),),
+        )
+        return rows[0] if rows else None
+
+    def search(
+        self,
+        text: str = None,
+        issuetype: str = None,
+        status: str = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        """
+        Search issues by summary text and/or issuetype/status filters.
+        Text matching uses full-text search (prefix match per word) when available.
+        """
+        clauses, params = self._filters(issuetype, status)
+
+        text = (text or "").strip()
+        if text and self._has_fts:
+            match = _fts_match_expression(text)
+            sql = (
+                "SELECT issues.key, issues.summary, issues.issuetype, issues.status "
+                "FROM issues_fts JOIN issues ON issues.id = issues_fts.rowid "
+                "WHERE issues_fts MATCH ?"
+            )
+            params.insert(0, match)
+            if clauses:
+                sql += " AND " + " AND ".join(clauses)
+            sql += " ORDER BY rank LIMIT ?"
+        else:
+            if text:
+                clauses.append("issues.summary LIKE ?")
+                params.append(f"%{text}%")
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            sql = f"SELECT key, summary, issuetype, status FROM issues{where} ORDER BY key LIMIT ?"
+
+        params.append(max(1, int(limit)))
+        return self._query(sql, tuple(params))
+
+
+# Global store instance - import this in other modules
+tcm_store = TCMStore()
@@ -0,0 +1,177 @@
+"""
+TCM Tools - Custom tools for the agent to run TCM analytics offline.
+These tools query the local TCM store instead of calling Jira.
+"""
+
+import json
+
+from scripts.tcm_store import tcm_store, GROUPABLE_FIELDS
+
+DEFAULT_SEARCH_LIMIT = 50
+
+
+def get_tcm_breakdown_tool_def() -> dict:
+    """
+    Return the tool definition for tcm_breakdown.
+    This format is compatible with the Claude Agent SDK.
+    """
+    return {
+        "name": "tcm_breakdown",
+        "description": (
+            "Count issues in the TSG Capacity Management Tool (TCM) grouped by issuetype or status, "
+            "from a local snapshot of every TCM issue (Clients, Projects, Candidates, operations, etc.). "
+            "Use this for questions like 'how many candidates are there?' or 'what statuses do projects have?'. "
+            "Optionally filter by issuetype and/or status first."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "group_by": {
+                    "type": "string",
+                    "enum": list(GROUPABLE_FIELDS),
+                    "description": "Field to group counts by"
+                },
+                "issuetype": {
+                    "type": "string",
+                    "description": "Only count issues of this issuetype (e.g. 'Candidate')"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Only count issues in this status"
+                }
+            },
+            "required": ["group_by"]
+        }
+    }
+
+
+def get_search_tcm_issues_tool_def() -> dict:
+    """
+    Return the tool definition for search_tcm_issues.
+    This format is compatible with the Claude Agent SDK.
+    """
+    return {
+        "name": "search_tcm_issues",
+        "description": (
+            "Search all TSG Capacity Management Tool (TCM) issues in the local snapshot by summary text, "
+            "issuetype and/or status, or look up a single issue by TCM key. "
+            "Covers every issuetype, not just active Clients and Projects."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Words to search for in the issue summary"
+                },
+                "key": {
+                    "type": "string",
+                    "description": "Exact TCM key to look up (e.g. 'TCM-27829')"
+                },
+                "issuetype": {
+                    "type": "string",
+                    "description": "Only return issues of this issuetype"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Only return issues in this status"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of issues to return (default 50)"
+                }
+            },
+            "required": []
+        }
+    }
+
+
+def _text_result(text: str) -> dict:
+    return {
+        "content": [{
+            "type": "text",
+            "text": text
+        }]
+    }
+
+
+def _not_loaded_result() -> dict:
+    return _text_result(
+        "No TCM snapshot loaded. Run scripts/get_active_projects.py to create the dump."
+    )
+
+
+async def handle_tcm_breakdown(args: dict) -> dict:
+    """
+    Handler for the tcm_breakdown tool.
+    Returns issue counts grouped by issuetype or status.
+    """
+    if not tcm_store.is_loaded():
+        return _not_loaded_result()
+
+    group_by = args.get("group_by") or "issuetype"
+    try:
+        groups = tcm_store.breakdown(group_by, args.get("issuetype"), args.get("status"))
+    except ValueError as e:
+        return _text_result(str(e))
+
+    total = sum(g["count"] for g in groups)
+    lines = [f"  - {g['value'] or '(none)'}: {g['count']}" for g in groups]
+    output = f"TCM issues by {group_by} ({total} total):\n" + "\n".join(lines)
+    return _text_result(output)
+
+
+async def handle_search_tcm_issues(args: dict) -> dict:
+    """
+    Handler for the search_tcm_issues tool.
+    Returns matching TCM issues from the local snapshot.
+    """
+    if not tcm_store.is_loaded():
+        return _not_loaded_result()
+
+    key = args.get("key")
+    if key:
+        issue = tcm_store.get(key)
+        if issue is None:
+            return _text_result(f"No TCM issue found with key '{key}'.")
+        return _text_result(json.dumps(issue, indent=2))
+
+    # The model occasionally sends a non-numeric limit - fall back to the default
+    try:
+        limit = int(args.get("limit") or DEFAULT_SEARCH_LIMIT)
+    except (TypeError, ValueError):
+        limit = DEFAULT_SEARCH_LIMIT
+
+    issues = tcm_store.search(
+        text=args.get("text"),
+        issuetype=args.get("issuetype"),
+        status=args.get("status"),
+        limit=limit,
+    )
+    if not issues:
+        return _text_result("No matching TCM issues found.")
+
+    lines = [f"  - {i['key']}: {i['summary']} [{i['issuetype']} / {i['status']}]" for i in issues]
+    output = f"Matching TCM issues ({len(issues)} shown):\n" + "\n".join(lines)
+    return _text_result(output)
+
+
+def get_tcm_tool_definitions() -> list[dict]:
+    """
+    Return all TCM store tool definitions.
+    Use this to register the tools with the agent.
+    """
+    return [
+        get_tcm_breakdown_tool_def(),
+        get_search_tcm_issues_tool_def()
+    ]
+
+
+def get_tcm_tool_handlers() -> dict:
+    """
+    Return a mapping of tool names to their async handlers.
+    """
+    return {
+        "tcm_breakdown": handle_tcm_breakdown,
+        "search_tcm_issues": handle_search_tcm_issues
+    }
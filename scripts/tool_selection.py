@@ -0,0 +1,142 @@
+"""
+Tool Selection - Chooses which tools to expose to the model each turn.
+Starts every session with a compact core set and only adds the remaining
+CData tools (procedures, etc.) once the conversation needs them, so tool
+descriptions and schemas don't inflate every request.
+"""
+
+import json
+import re
+from typing import Optional
+
+# CData tools every session gets - enough for discovery and SQL queries
+CORE_CDATA_TOOLS = {"getInstructions", "queryData", "getCatalogs", "getSchemas", "getTables", "getColumns"}
+
+# Messages matching this need the extended CData tools (stored procedures and actions)
+EXTENDED_TOOLS_PATTERN = re.compile(
+    r"\b(?:procedures?|stored\s+proc\w*|execute|exec|run\s+(?:an?\s+)?action)\b",
+    re.IGNORECASE,
+)
+
+# Tool descriptions are only whitespace-collapsed by default: CData's carry the
+# SQL dialect and usage rules the model relies on. Property descriptions are
+# short hints and are cut.
+MAX_PROPERTY_DESCRIPTION_CHARS = 120
+
+# Schema keys the model doesn't need to call a tool correctly
+_DROPPED_SCHEMA_KEYS = {"title", "$schema", "examples", "$comment"}
+
+
+def estimate_tokens(value) -> int:
+    """Rough token estimate (~4 characters per token) of a string or JSON value."""
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"))
+    return (len(text) + 3) // 4
+
+
+def compact_description(text: str, max_chars: Optional[int] = None) -> str:
+    """
+    Collapse whitespace and, if max_chars is given, keep whole leading
+    sentences up to max_chars. Falls back to a hard cut if the first sentence
+    alone is too long.
+    """
+    text = " ".join((text or "").split())
+    if max_chars is None or len(text) <= max_chars:
+        return text
+
+    kept = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        candidate = f"{kept} {sentence}".strip()
+        if len(candidate) > max_chars:
+            break
+        kept = candidate
+    return kept or text[:max_chars - 3].rstrip() + "..."
+
+
+def compact_schema(schema, property_max_chars: int = MAX_PROPERTY_DESCRIPTION_CHARS):
+    """Return a copy of a JSON schema without titles/examples and with short descriptions."""
+    if isinstance(schema, list):
+        return [compact_schema(item, property_max_chars) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    compacted = {}
+    for key, value in schema.items():
+        if key in _DROPPED_SCHEMA_KEYS:
+            continue
+        if key == "description" and isinstance(value, str):
+            compacted[key] = compact_description(value, property_max_chars)
+        elif key == "properties" and isinstance(value, dict):
+            # Property names are user data, not schema keywords - never drop them
+            compacted[key] = {name: compact_schema(prop, property_max_chars) for name, prop in value.items()}
+        else:
+            compacted[key] = compact_schema(value, property_max_chars)
+    return compacted
+
+
+def compact_tool_def(tool_def: dict, max_description_chars: Optional[int] = None) -> dict:
+    """Return a tool definition with compacted description and input schema."""
+    return {
+        **tool_def,
+        "description": compact_description(tool_def.get("description", ""), max_description_chars),
+        "inputSchema": compact_schema(tool_def.get("inputSchema", {})),
+    }
+
+
+class ToolSelector:
+    """
+    Tracks which tools are exposed in the current session.
+
+    Local tools (active projects, TCM store) and CORE_CDATA_TOOLS are always
+    exposed. The remaining CData tools are added - and stay added for the
+    rest of the session - the first time a user message asks for them.
+    """
+
+    def __init__(
+        self,
+        cdata_tool_defs: list[dict],
+        local_tool_defs: list[dict],
+        max_description_chars: Optional[int] = None,
+    ):
+        """
+        Args:
+            cdata_tool_defs: Tool definitions from the CData MCP server
+            local_tool_defs: Active projects and TCM tool definitions
+            max_description_chars: Cut tool descriptions to this many characters
+                (whole sentences); by default they are only whitespace-collapsed
+        """
+        self._all_defs = cdata_tool_defs + local_tool_defs
+        self._extended = {
+            t["name"] for t in cdata_tool_defs if t["name"] not in CORE_CDATA_TOOLS
+        }
+        self.exposed: set[str] = {t["name"] for t in self._all_defs} - self._extended
+        self._full_tokens = estimate_tokens(self._all_defs)
+        self._compact = {t["name"]: compact_tool_def(t, max_description_chars) for t in self._all_defs}
+
+    def needs_extended(self, user_message: str) -> bool:
+        """Check whether a message asks for tools that aren't exposed yet."""
+        return bool(self._extended - self.exposed) and bool(EXTENDED_TOOLS_PATTERN.search(user_message))
+
+    def expand(self) -> None:
+        """Expose every tool from now on."""
+        self.exposed |= self._extended
+
+    def exposed_defs(self) -> list[dict]:
+        """Compacted definitions of the currently exposed tools, in registration order."""
+        return [self._compact[t["name"]] for t in self._all_defs if t["name"] in self.exposed]
+
+    def token_report(self) -> dict:
+        """
+        Estimated tool-definition tokens sent with every model request.
+
+        Returns:
+            dict with full_tokens (every tool, uncompacted), exposed_tokens,
+            saved_tokens, exposed_count and total_count
+        """
+        exposed_tokens = estimate_tokens(self.exposed_defs())
+        return {
+            "full_tokens": self._full_tokens,
+            "exposed_tokens": exposed_tokens,
+            "saved_tokens": self._full_tokens - exposed_tokens,
+            "exposed_count": len(self.exposed),
+            "total_count": len(self._all_defs),
+        }
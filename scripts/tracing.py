@@ -0,0 +1,135 @@
+"""
+Tracing - Lightweight span recorder that writes Chrome trace event JSON.
+Each chat turn is written to its own file, viewable in Perfetto
+(https://ui.perfetto.dev) or chrome://tracing, to find serial tool chains
+and slow upstream calls.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+class Tracer:
+    """
+    Records spans as Chrome trace "complete" events.
+    Disabled (near-zero overhead) until configure() is given an output directory.
+
+    Each asyncio task gets its own track, so concurrent tool calls show up
+    side by side instead of overlapping on one row.
+    """
+
+    def __init__(self):
+        self._output_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self._events: list[dict] = []
+        self._tracks: dict[tuple, int] = {}
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self) -> bool:
+        return self._output_dir is not None
+
+    def configure(self, output_dir: Optional[str]) -> None:
+        """Enable tracing, writing trace files to output_dir (None disables)."""
+        self._output_dir = output_dir
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def _track_id(self) -> int:
+        """Return a small, stable track id for the current thread/asyncio task."""
+        # asyncio is slow to import; if nothing has imported it, no task can be running
+        asyncio = sys.modules.get("asyncio")
+        task = None
+        if asyncio is not None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                pass
+        thread = threading.current_thread()
+        key = (thread.ident, id(task) if task else None)
+
+        with self._lock:
+            tid = self._tracks.get(key)
+            if tid is None:
+                tid = self._tracks[key] = len(self._tracks) + 1
+                track_name = task.get_name() if task else thread.name
+                self._events.append({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                    "args": {"name": track_name},
+                })
+        return tid
+
+    def _append(self, event: dict) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def add_complete(self, name: str, cat: str, start_us: float, end_us: float, **args) -> None:
+        """Record a span whose start/end (microseconds, see now()) were measured by the caller."""
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": max(0.0, end_us - start_us),
+            "pid": self._pid, "tid": self._track_id(), "args": args,
+        })
+
+    def instant(self, name: str, cat: str, **args) -> None:
+        """Record a point-in-time event."""
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": cat, "ph": "i", "s": "t", "ts": _now_us(),
+            "pid": self._pid, "tid": self._track_id(), "args": args,
+        })
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args):
+        """Record the enclosed block as a span."""
+        if not self.enabled:
+            yield
+            return
+        start = _now_us()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.add_complete(name, cat, start, _now_us(), **args)
+
+    @staticmethod
+    def now() -> float:
+        """Current trace clock in microseconds."""
+        return _now_us()
+
+    def flush(self, label: str) -> Optional[str]:
+        """
+        Write all events recorded since the last flush to
+        {output_dir}/{timestamp}-{label}.json and clear the buffer.
+        Returns the file path, or None if tracing is disabled or nothing was recorded.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            events, self._events = self._events, []
+            # Track names must be re-emitted in every file
+            self._tracks.clear()
+        if not any(e["ph"] != "M" for e in events):
+            return None
+
+        path = os.path.join(self._output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}.json")
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+# Global tracer instance - import this in other modules
+tracer = Tracer()
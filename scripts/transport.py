@@ -0,0 +1,209 @@
+"""
+Transport - Pluggable HTTP transport for the CData MCP client and Jira fetches.
+Live mode sends real requests; record mode also captures every request/response
+pair (SSE bodies included) to a gzip'd JSON-lines cassette; replay mode serves
+them back from the cassette with the original (or scaled) timing.
+"""
+
+import gzip
+import json as jsonlib
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+DEFAULT_CASSETTE_PATH = "cassettes/session.jsonl.gz"
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class TransportResponse:
+    """
+    Minimal response object shared by every transport.
+    Mirrors the parts of requests.Response the clients use.
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: dict, request_body: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.request = SimpleNamespace(body=request_body)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError for 4xx/5xx responses, like requests does."""
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def _encode_body(json: Optional[dict]) -> bytes:
+    return jsonlib.dumps(json).encode() if json is not None else b""
+
+
+class Transport:
+    """Base transport: POST a JSON body and return a TransportResponse."""
+
+    def post(self, url: str, headers: dict = None, json: dict = None) -> TransportResponse:
+        raise NotImplementedError
+
+
+class LiveTransport(Transport):
+    """
+    Sends real HTTP requests through a requests.Session per thread (connection
+    reuse). requests.Session isn't thread-safe, and posts come from the event
+    loop's to_thread workers and the metadata warmer pool at the same time.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _get_session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+        return session
+
+    def post(self, url: str, headers: dict = None, json: dict = None) -> TransportResponse:
+        body = _encode_body(json)
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        resp = self._get_session().post(url, headers=headers, data=body)
+        return TransportResponse(url, resp.status_code, resp.content, dict(resp.headers), body)
+
+
+class RecordingTransport(Transport):
+    """
+    Wraps another transport and appends every exchange to a cassette.
+    Request headers are never written, so credentials stay out of cassettes.
+    """
+
+    def __init__(self, inner: Transport, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        os.makedirs(os.path.dirname(cassette_path) or ".", exist_ok=True)
+
+    def post(self, url: str, headers: dict = None, json: dict = None) -> TransportResponse:
+        start = time.perf_counter()
+        resp = self.inner.post(url, headers=headers, json=json)
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            "url": url,
+            "request": json,
+            "status": resp.status_code,
+            "content_type": resp.headers.get("Content-Type", ""),
+            "body": resp.text,
+            "offset": start - self._started,
+            "elapsed": elapsed,
+        }
+        line = (jsonlib.dumps(entry, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            # Each append becomes its own gzip member; gzip readers concatenate them
+            with gzip.open(self.cassette_path, "ab") as f:
+                f.write(line)
+        return resp
+
+
+def _match_key(url: str, json: Optional[dict]) -> str:
+    return url + " " + jsonlib.dumps(json, sort_keys=True, separators=(",", ":"))
+
+
+def load_cassette(cassette_path: str) -> list[dict]:
+    """Read every recorded exchange from a cassette, in recording order."""
+    with gzip.open(cassette_path, "rt") as f:
+        return [jsonlib.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(Transport):
+    """
+    Serves recorded responses for matching requests (same URL and JSON body).
+
+    Repeated identical requests get their recorded responses in order,
+    cycling once exhausted, so a short cassette can drive a long load test.
+
+    Args:
+        cassette_path: Cassette written by RecordingTransport
+        time_scale: Multiplier for recorded latency (1.0 = original timing, 0 = no delay)
+    """
+
+    def __init__(self, cassette_path: str, time_scale: float = 1.0):
+        self.cassette_path = cassette_path
+        self.time_scale = time_scale
+        self.entries = load_cassette(cassette_path)
+        self._by_key: dict[str, list[dict]] = {}
+        for entry in self.entries:
+            self._by_key.setdefault(_match_key(entry["url"], entry["request"]), []).append(entry)
+        self._cursors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def post(self, url: str, headers: dict = None, json: dict = None) -> TransportResponse:
+        key = _match_key(url, json)
+        recorded = self._by_key.get(key)
+        if not recorded:
+            raise CassetteMiss(f"No recorded response for POST {url} {jsonlib.dumps(json)[:200]}")
+
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        entry = recorded[cursor % len(recorded)]
+
+        if self.time_scale:
+            time.sleep(entry["elapsed"] * self.time_scale)
+        return TransportResponse(
+            url,
+            entry["status"],
+            entry["body"].encode(),
+            {"Content-Type": entry["content_type"]},
+            _encode_body(json),
+        )
+
+
+_default_transport: Optional[Transport] = None
+
+
+def get_default_transport() -> Transport:
+    """Return the process-wide transport (live unless configured otherwise)."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = LiveTransport()
+    return _default_transport
+
+
+def set_default_transport(transport: Optional[Transport]) -> None:
+    """Replace the process-wide transport (None resets to live)."""
+    global _default_transport
+    _default_transport = transport
+
+
+def configure_transport_from_env() -> str:
+    """
+    Set the default transport from TRANSPORT_MODE (live/record/replay),
+    TRANSPORT_CASSETTE and TRANSPORT_TIME_SCALE.
+    Returns the mode in effect.
+    """
+    mode = os.environ.get("TRANSPORT_MODE", "live").lower()
+    cassette = os.environ.get("TRANSPORT_CASSETTE", DEFAULT_CASSETTE_PATH)
+
+    if mode == "record":
+        set_default_transport(RecordingTransport(LiveTransport(), cassette))
+    elif mode == "replay":
+        time_scale = float(os.environ.get("TRANSPORT_TIME_SCALE", "1.0"))
+        set_default_transport(ReplayTransport(cassette, time_scale))
+    elif mode == "live":
+        set_default_transport(LiveTransport())
+    else:
+        raise ValueError(f"Unknown TRANSPORT_MODE: {mode} (expected live, record or replay)")
+    return mode
@@ -0,0 +1,60 @@
+"""Offline tests for the Jira/CData clients against the benchmark fake servers"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_servers import FakeJiraServer, FakeCDataServer, CDATA_TOOL_NAMES
+from benchmarks.run_benchmarks import compare
+from scripts.get_active_projects import get_active_projects_from_tcm
+
+
+class TestFakeJiraServer:
+    """Test get_active_projects_from_tcm against the fake Jira server."""
+
+    def test_follows_pagination(self):
+        with FakeJiraServer(project_count=250, other_count=30) as jira:
+            projects = get_active_projects_from_tcm(jira.url, "user@example.com", "token", max_results=100)
+            assert len(projects) == 250
+            assert jira.request_count == 3
+            assert projects[0] == {"key": "TCM-1", "name": "Client 0"}
+            assert len({p["key"] for p in projects}) == 250
+
+
+class TestFakeCDataServer:
+    """Test MCPClient against the fake CData MCP server."""
+
+    def test_list_and_call_tools(self):
+        from agent_chatbot import MCPClient
+
+        with FakeCDataServer(payload_bytes=4096) as cdata:
+            client = MCPClient(cdata.url, "user@example.com", "token")
+            assert [t["name"] for t in client.list_tools()] == CDATA_TOOL_NAMES
+
+            result = client.call_tool("queryData", {"query": "SELECT 1"})
+            assert result["isError"] is False
+            assert len(result["content"][0]["text"]) >= 2048
+
+
+class TestCompare:
+    """Test baseline comparison in the benchmark runner."""
+
+    def test_flags_regressions_in_both_directions(self):
+        baseline = [
+            {"name": "startup_seconds", "value": 1.0, "unit": "s", "better": "lower"},
+            {"name": "ops", "value": 100.0, "unit": "ops/s", "better": "higher"},
+        ]
+        current = [
+            {"name": "startup_seconds", "value": 1.5, "unit": "s", "better": "lower"},
+            {"name": "ops", "value": 90.0, "unit": "ops/s", "better": "higher"},
+        ]
+        regressions = compare(current, baseline, tolerance=0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("startup_seconds")
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,79 @@
+"""Import-time budget tests for the scripts package and agent_chatbot"""
+
+import json
+import pytest
+import sys
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-import budgets in milliseconds, overridable for slow CI hosts
+SCRIPTS_IMPORT_BUDGET_MS = float(os.environ.get("SCRIPTS_IMPORT_BUDGET_MS", "50"))
+AGENT_IMPORT_BUDGET_MS = float(os.environ.get("AGENT_IMPORT_BUDGET_MS", "300"))
+
+# Modules that must stay deferred until actually needed
+HEAVY_MODULES = ["requests", "dotenv", "claude_agent_sdk", "http.server", "scripts.get_active_projects"]
+
+
+def _cold_import(statement: str, runs: int = 3) -> tuple[float, list[str]]:
+    """
+    Run `statement` in fresh interpreters.
+    Returns (best time in ms, heavy modules loaded by the statement).
+    """
+    code = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = (time.perf_counter() - t) * 1000\n"
+        f"print(json.dumps([elapsed, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    best, loaded = None, []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        elapsed, loaded = json.loads(out.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+class TestImportTime:
+    """Cold import of the package and the chatbot stays within budget."""
+
+    def test_scripts_package(self):
+        elapsed, loaded = _cold_import("import scripts")
+        assert loaded == []
+        assert elapsed < SCRIPTS_IMPORT_BUDGET_MS, f"import scripts took {elapsed:.1f}ms"
+
+    def test_cache_and_prompts_stay_light(self):
+        elapsed, loaded = _cold_import(
+            "from scripts import ActiveProjectsCache, build_simple_system_prompt, build_scalable_system_prompt"
+        )
+        assert loaded == []
+        assert elapsed < SCRIPTS_IMPORT_BUDGET_MS, f"cache + prompt import took {elapsed:.1f}ms"
+
+    def test_agent_chatbot(self):
+        elapsed, loaded = _cold_import("import agent_chatbot")
+        assert "claude_agent_sdk" not in loaded
+        assert "requests" not in loaded
+        assert elapsed < AGENT_IMPORT_BUDGET_MS, f"import agent_chatbot took {elapsed:.1f}ms"
+
+    def test_lazy_exports_resolve(self):
+        _, loaded = _cold_import(
+            "import scripts\n"
+            "assert type(scripts.default_active_projects_cache).__name__ == 'ActiveProjectsCache'\n"
+            "import scripts.metrics as metrics_module\n"
+            "assert type(metrics_module).__name__ == 'module'\n"
+            "assert scripts.default_metrics is metrics_module.metrics\n"
+            "import scripts.tcm_store as tcm_store_module\n"
+            "assert tcm_store_module.TCMStore is scripts.TCMStore\n"
+            "assert scripts.get_active_projects_from_tcm.__name__ == 'get_active_projects_from_tcm'",
+            runs=1,
+        )
+        assert "scripts.get_active_projects" in loaded
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
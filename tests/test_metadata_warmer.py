@@ -0,0 +1,150 @@
+"""Tests for metadata_warmer.py"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_servers import FakeCDataServer
+from scripts.metadata_warmer import MetadataWarmer, extract_names
+
+
+def _result(text: str) -> dict:
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+
+DISCOVERY = [
+    ("getCatalogs", {}),
+    ("getSchemas", {"catalogName": "Catalog0"}),
+    ("getTables", {"catalogName": "Catalog0", "schemaName": "Schema1"}),
+    ("getColumns", {"catalogName": "Catalog0", "schemaName": "Schema1", "tableName": "Table0"}),
+]
+
+
+class TestExtractNames:
+    """Test reading names out of metadata results."""
+
+    def test_json_rows(self):
+        rows = [{"CatalogName": "Jira1", "Other": "x"}, {"CatalogName": "Confluence1"}, {"CatalogName": "Jira1"}]
+        assert extract_names("getCatalogs", _result(json.dumps(rows))) == ["Jira1", "Confluence1"]
+
+    def test_results_wrapper(self):
+        text = json.dumps({"results": [{
+            "schema": [{"columnName": "TABLE_CATALOG"}, {"columnName": "TABLE_SCHEMA"}],
+            "rows": [["Jira1", "Jira"]],
+        }]})
+        assert extract_names("getSchemas", _result(text)) == ["Jira"]
+
+    def test_csv_and_unknown_formats(self):
+        assert extract_names("getTables", _result("TableName,TableType\nIssues,TABLE\n")) == ["Issues"]
+        assert extract_names("getTables", _result("no tables here")) == []
+
+
+class TestMetadataWarmer:
+    """Test background warming against the fake CData server."""
+
+    def test_warms_every_level(self):
+        from agent_chatbot import MCPClient
+
+        with FakeCDataServer(metadata_fanout=2) as cdata:
+            warmer = MetadataWarmer(MCPClient(cdata.url).call_tool, concurrency=3)
+            warmer.start()
+            assert warmer.wait(10)
+            # 1 catalog list + 2 schema lists + 4 table lists + 8 column lists
+            assert cdata.request_count == 15
+            assert warmer.store.count("getColumns") == 8
+
+    def test_max_tables_and_catalog_filter(self):
+        from agent_chatbot import MCPClient
+
+        with FakeCDataServer(metadata_fanout=3) as cdata:
+            warmer = MetadataWarmer(MCPClient(cdata.url).call_tool, max_tables=4, catalogs=["Catalog2"])
+            warmer.start()
+            assert warmer.wait(10)
+            assert warmer.store.count("getSchemas") == 1
+            assert warmer.store.count("getColumns") == 4
+
+    def test_concurrency_is_bounded(self):
+        from agent_chatbot import MCPClient
+
+        active, peak, lock = 0, 0, threading.Lock()
+
+        with FakeCDataServer(metadata_fanout=3, latency=0.02) as cdata:
+            client = MCPClient(cdata.url)
+
+            def call_tool(tool_name, args):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                try:
+                    return client.call_tool(tool_name, args)
+                finally:
+                    with lock:
+                        active -= 1
+
+            warmer = MetadataWarmer(call_tool, concurrency=2)
+            warmer.start()
+            assert warmer.wait(10)
+        assert peak == 2
+
+    def test_wait_covers_direct_fetch_of_cancelled_call(self):
+        gates = {"Catalog0": threading.Event(), "Catalog1": threading.Event()}
+
+        def call_tool(tool_name, args):
+            if tool_name == "getCatalogs":
+                return _result(json.dumps([{"CatalogName": "Catalog0"}, {"CatalogName": "Catalog1"}]))
+            if tool_name == "getSchemas":
+                gates[args["catalogName"]].wait(5)
+                schemas = [{"SchemaName": "Schema0"}] if args["catalogName"] == "Catalog1" else []
+                return _result(json.dumps(schemas))
+            return _result("[]")
+
+        warmer = MetadataWarmer(call_tool, concurrency=1)
+        warmer.start()
+        while warmer.store.count("getCatalogs") == 0:
+            time.sleep(0.001)
+
+        # getSchemas(Catalog1) is still queued, so the user's call cancels it and fetches directly
+        user_call = threading.Thread(
+            target=asyncio.run, args=(warmer.call("getSchemas", {"catalogName": "Catalog1"}),)
+        )
+        user_call.start()
+        while len(warmer._inflight) > 1:
+            time.sleep(0.001)
+        gates["Catalog0"].set()
+        assert not warmer.wait(0.2)
+
+        gates["Catalog1"].set()
+        user_call.join(5)
+        assert warmer.wait(5)
+        assert warmer.store.count("getTables") == 1
+
+    def test_chatbot_answers_discovery_from_store(self):
+        from agent_chatbot import ConfluenceAgentChatbot
+
+        with FakeCDataServer(metadata_fanout=2, latency=0.05) as cdata:
+            chatbot = ConfluenceAgentChatbot(cdata.url, "user@example.com", "token")
+            chatbot.start_metadata_warmer(concurrency=4)
+            assert chatbot.metadata_warmer.wait(10)
+
+            requests_before = cdata.request_count
+            start = time.perf_counter()
+            results = [asyncio.run(chatbot._cdata_tool_handler(tool_name, args)) for tool_name, args in DISCOVERY]
+            assert "Column0" in results[-1]["content"][0]["text"]
+            assert cdata.request_count == requests_before
+            assert time.perf_counter() - start < 0.05
+
+            # Anything not warmed still goes to CData
+            asyncio.run(chatbot._cdata_tool_handler("getColumns", {"tableName": "Issues"}))
+            assert cdata.request_count == requests_before + 1
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
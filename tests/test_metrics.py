@@ -0,0 +1,107 @@
+"""Tests for metrics.py"""
+
+import importlib
+import json
+import pytest
+import sys
+import os
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.metrics import LatencyHistogram, MetricsRegistry, start_http_server, write_json
+from scripts.active_projects_cache import ActiveProjectsCache
+
+# The scripts package re-exports the cache *instance* under the module's name
+cache_module = importlib.import_module("scripts.active_projects_cache")
+
+
+class TestLatencyHistogram:
+    """Test the HDR-style latency histogram."""
+
+    def test_quantiles_within_one_percent(self):
+        h = LatencyHistogram()
+        for ms in range(1, 1001):
+            h.record(ms / 1000)
+        assert h.count == 1000
+        assert h.quantile(0.5) == pytest.approx(0.5, rel=0.01)
+        assert h.quantile(0.99) == pytest.approx(0.99, rel=0.01)
+        assert h.min == pytest.approx(0.001)
+        assert h.max == pytest.approx(1.0)
+
+    def test_large_values(self):
+        h = LatencyHistogram()
+        h.record(42.0)
+        assert h.quantile(0.5) == pytest.approx(42.0, rel=0.01)
+
+    def test_empty(self):
+        assert LatencyHistogram().quantile(0.9) == 0.0
+
+
+class TestMetricsRegistry:
+    """Test the MetricsRegistry class."""
+
+    def test_timed_records_calls_and_errors(self):
+        registry = MetricsRegistry()
+        with registry.timed("tool", tool="queryData"):
+            pass
+        with pytest.raises(RuntimeError):
+            with registry.timed("tool", tool="queryData"):
+                raise RuntimeError("boom")
+
+        assert registry.get_counter("tool_calls_total", tool="queryData") == 2
+        assert registry.get_counter("tool_errors_total", tool="queryData") == 1
+        histograms = registry.snapshot()["histograms"]["tool_latency_seconds"]
+        assert histograms[0]["count"] == 2
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.inc("upstream_response_bytes_total", 1234567, upstream="cdata")
+        registry.observe("upstream_latency_seconds", 0.25, upstream="cdata")
+        text = registry.to_prometheus()
+
+        assert "# TYPE assistant_upstream_response_bytes_total counter" in text
+        assert 'assistant_upstream_response_bytes_total{upstream="cdata"} 1234567' in text
+        assert 'assistant_upstream_latency_seconds{upstream="cdata",quantile="0.5"}' in text
+        assert 'assistant_upstream_latency_seconds_count{upstream="cdata"} 1' in text
+
+    def test_format_stats_cache_hit_rate(self):
+        registry = MetricsRegistry()
+        registry.inc("cache_lookups_total", cache="active_projects", result="hit")
+        registry.inc("cache_lookups_total", cache="active_projects", result="partial")
+        registry.inc("cache_lookups_total", cache="active_projects", result="miss")
+        registry.inc("cache_lookups_total", cache="active_projects", result="miss")
+        assert "cache active_projects: 2/4 hits (50%)" in registry.format_stats()
+
+    def test_cache_records_lookups(self, monkeypatch):
+        registry = MetricsRegistry()
+        monkeypatch.setattr(cache_module, "metrics", registry)
+        cache = ActiveProjectsCache()
+        cache.load_projects([{"key": "TCM-1", "name": "Thrivent"}])
+
+        cache.is_active("TCM-1")
+        cache.is_active("Acme Corp")
+        assert registry.get_counter("cache_lookups_total", cache="active_projects", result="hit") == 1
+        assert registry.get_counter("cache_lookups_total", cache="active_projects", result="miss") == 1
+
+    def test_exporters(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.inc("tool_calls_total", tool="queryData")
+
+        path = tmp_path / "metrics.json"
+        write_json(str(path), registry)
+        assert json.loads(path.read_text())["counters"]["tool_calls_total"][0]["value"] == 1
+
+        server = start_http_server(0, registry=registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+                assert b"assistant_tool_calls_total" in resp.read()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
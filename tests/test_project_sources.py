@@ -0,0 +1,153 @@
+"""Tests for project_sources.py and multi-source ActiveProjectsCache loading"""
+
+import pytest
+import sqlite3
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.active_projects_cache import ActiveProjectsCache
+from scripts.project_sources import (
+    CSVSource,
+    ProjectSource,
+    SQLiteSource,
+    SourceTimeout,
+    fetch_all,
+    merge_projects,
+)
+
+
+class StaticSource(ProjectSource):
+    """Returns fixed projects after an optional delay."""
+
+    def __init__(self, name: str, projects: list[dict], delay: float = 0.0, timeout: float = 5.0):
+        super().__init__(timeout)
+        self.name = name
+        self.projects = projects
+        self.delay = delay
+
+    def fetch(self) -> list[dict]:
+        time.sleep(self.delay)
+        return self.projects
+
+
+class FailingSource(ProjectSource):
+    name = "broken"
+
+    def fetch(self) -> list[dict]:
+        raise ConnectionError("upstream down")
+
+
+TCM_PROJECTS = [{"key": "TCM-1", "name": "Thrivent"}, {"key": "TCM-2", "name": "Medtronic"}]
+
+
+class TestLocalSources:
+    """Test the CSV and SQLite sources."""
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "projects.csv"
+        path.write_text("key,name,active\nTCM-1,Thrivent,yes\n,Acme Corp,true\nTCM-9,Old Client,false\n")
+        assert CSVSource(str(path)).fetch() == [
+            {"key": "TCM-1", "name": "Thrivent"},
+            {"key": "", "name": "Acme Corp"},
+        ]
+
+    def test_sqlite(self, tmp_path):
+        path = str(tmp_path / "projects.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE active_projects (key TEXT, name TEXT)")
+        conn.execute("INSERT INTO active_projects VALUES ('TCM-2', 'Medtronic')")
+        conn.commit()
+        conn.close()
+        assert SQLiteSource(path).fetch() == [{"key": "TCM-2", "name": "Medtronic"}]
+
+    def test_sqlite_missing_file_is_an_error(self, tmp_path):
+        path = tmp_path / "missing.db"
+        with pytest.raises(sqlite3.OperationalError):
+            SQLiteSource(str(path)).fetch()
+        assert not path.exists()
+
+
+class TestMerge:
+    """Test merging and deduplication."""
+
+    def test_dedupes_by_key_then_name_with_provenance(self):
+        merged = merge_projects([
+            ("tcm", TCM_PROJECTS),
+            ("csv", [
+                {"key": "tcm-1", "name": "Thrivent Financial"},
+                {"key": "", "name": "MEDTRONIC"},
+                {"key": "", "name": "Acme Corp"},
+            ]),
+        ])
+        assert merged == [
+            {"key": "TCM-1", "name": "Thrivent", "sources": ["tcm", "csv"]},
+            {"key": "TCM-2", "name": "Medtronic", "sources": ["tcm", "csv"]},
+            {"key": "Acme Corp", "name": "Acme Corp", "sources": ["csv"]},
+        ]
+
+    def test_same_name_different_keys_kept(self):
+        merged = merge_projects([("tcm", [{"key": "TCM-1", "name": "Thrivent"}, {"key": "TCM-2", "name": "Thrivent"}])])
+        assert len(merged) == 2
+
+    def test_other_source_key_falls_back_to_name(self):
+        merged = merge_projects([
+            ("tcm", TCM_PROJECTS),
+            ("csv", [{"key": "ACME-7", "name": "thrivent"}]),
+            ("sqlite", [{"key": "acme-7", "name": "Thrivent Financial"}]),
+        ])
+        assert merged[0] == {"key": "TCM-1", "name": "Thrivent", "sources": ["tcm", "csv", "sqlite"]}
+        assert len(merged) == len(TCM_PROJECTS)
+
+
+class TestFetchAll:
+    """Test concurrent fetching with per-source timeouts."""
+
+    def test_latencies_overlap(self):
+        sources = [StaticSource(f"s{i}", TCM_PROJECTS, delay=0.2) for i in range(4)]
+        start = time.perf_counter()
+        results, errors = fetch_all(sources)
+        assert time.perf_counter() - start < 0.5
+        assert [name for name, _ in results] == ["s0", "s1", "s2", "s3"]
+        assert errors == {}
+
+    def test_slow_and_failing_sources_are_skipped(self):
+        sources = [
+            StaticSource("tcm", TCM_PROJECTS),
+            StaticSource("slow", TCM_PROJECTS, delay=2.0, timeout=0.1),
+            FailingSource(),
+        ]
+        start = time.perf_counter()
+        results, errors = fetch_all(sources)
+        assert time.perf_counter() - start < 1.0
+        assert [name for name, _ in results] == ["tcm"]
+        assert isinstance(errors["slow"], SourceTimeout)
+        assert isinstance(errors["broken"], ConnectionError)
+
+
+class TestMultiSourceCache:
+    """Test ActiveProjectsCache with several sources."""
+
+    def test_load_merges_and_indexes(self):
+        cache = ActiveProjectsCache(sources=[
+            StaticSource("tcm", TCM_PROJECTS),
+            StaticSource("csv", [{"key": "", "name": "Acme Corp"}]),
+            FailingSource(),
+        ])
+        assert cache.load() == 3
+        assert list(cache.source_errors) == ["broken"]
+        assert cache.is_active("tcm-2")["matches"][0]["sources"] == ["tcm"]
+        assert cache.is_active("acme corp")["exact_match"]
+
+    def test_load_raises_when_every_source_fails(self):
+        cache = ActiveProjectsCache(sources=[FailingSource()])
+        with pytest.raises(ConnectionError):
+            cache.load()
+        assert not cache.is_loaded()
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
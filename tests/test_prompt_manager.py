@@ -0,0 +1,116 @@
+"""Tests for prompt_manager.py"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scripts.get_active_projects as get_active_projects
+from scripts.active_projects_cache import ActiveProjectsCache
+from scripts.prompt_manager import PromptManager, STRATEGY_SCALABLE, STRATEGY_SIMPLE
+from scripts.system_prompts import format_project_list
+from scripts.tool_selection import estimate_tokens
+
+
+def _projects(count: int) -> list[dict]:
+    return [{"key": f"TCM-{i}", "name": f"Client {i} Project"} for i in range(count)]
+
+
+@pytest.fixture
+def load_cache(monkeypatch):
+    """Return a function that loads a fresh cache with the given projects."""
+    cache = ActiveProjectsCache()
+
+    def load(projects):
+        monkeypatch.setattr(get_active_projects, "get_active_projects_from_tcm", lambda: projects)
+        cache.load()
+        return cache
+
+    return load
+
+
+class TestPromptManager:
+    """Test strategy selection and memoization."""
+
+    def test_small_list_is_injected(self, load_cache):
+        manager = PromptManager(load_cache(_projects(20)), token_budget=2000)
+        prompt = manager.get_system_prompt()
+        assert manager.strategy() == STRATEGY_SIMPLE
+        assert "TCM-19: Client 19 Project" in prompt
+        assert "is_project_active" not in prompt
+
+    def test_large_list_uses_tools(self, load_cache):
+        manager = PromptManager(load_cache(_projects(1000)), token_budget=2000)
+        prompt = manager.get_system_prompt()
+        assert manager.strategy() == STRATEGY_SCALABLE
+        assert manager.estimate_list_tokens() > 2000
+        assert "**1000 active projects/clients**" in prompt
+        assert "TCM-999" not in prompt
+
+    def test_list_tokens_match_rendered_list(self, load_cache):
+        projects = _projects(37)
+        manager = PromptManager(load_cache(projects))
+        assert manager.estimate_list_tokens() == estimate_tokens(format_project_list(projects))
+
+    def test_empty_cache_uses_tools(self):
+        manager = PromptManager(ActiveProjectsCache())
+        assert manager.strategy() == STRATEGY_SCALABLE
+        assert "None loaded" in manager.get_system_prompt()
+
+    def test_memoized_by_snapshot_version(self, load_cache):
+        cache = load_cache(_projects(5))
+        manager = PromptManager(cache)
+        first = manager.get_system_prompt()
+        assert manager.get_system_prompt() is first
+
+        load_cache(_projects(6))
+        second = manager.get_system_prompt()
+        assert second is not first
+        assert "TCM-5: Client 5 Project" in second
+
+    def test_output_independent_of_fetch_order(self, load_cache):
+        projects = _projects(30)
+        forward = PromptManager(load_cache(projects)).get_system_prompt()
+        backward = PromptManager(load_cache(projects[::-1])).get_system_prompt()
+        assert forward == backward
+
+    def test_prefix_stable_across_snapshots(self, load_cache):
+        cache = load_cache(_projects(5))
+        manager = PromptManager(cache)
+        before = manager.get_system_prompt()
+        load_cache(_projects(8))
+        after = manager.get_system_prompt()
+
+        prefix = os.path.commonprefix([before, after])
+        # Only the project section at the end differs
+        assert "## ACTIVE PROJECTS (Source: TSG Capacity Management Tool)" in prefix
+        assert len(before) - len(prefix) < 200
+
+
+class TestChatbotPrompt:
+    """Test that chatbot sessions follow the current snapshot's prompt."""
+
+    def test_sessions_use_current_prompt(self, load_cache):
+        from agent_chatbot import ConfluenceAgentChatbot
+        from benchmarks.fake_servers import FakeCDataServer
+
+        manager = PromptManager(load_cache(_projects(5)))
+        with FakeCDataServer() as cdata:
+            chatbot = ConfluenceAgentChatbot(cdata.url, "user@example.com", "token", prompt_manager=manager)
+        chatbot.create_session()
+        assert "TCM-4: Client 4 Project" in chatbot.session_prompt
+
+        load_cache(_projects(6))
+        assert chatbot.current_system_prompt() != chatbot.session_prompt
+        chatbot.create_session(resume="session-1")
+        assert "TCM-5: Client 5 Project" in chatbot.session_prompt
+
+        chatbot.create_session(system_prompt="Custom prompt")
+        load_cache(_projects(7))
+        assert chatbot.current_system_prompt() == "Custom prompt"
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
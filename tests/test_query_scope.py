@@ -0,0 +1,80 @@
+"""Tests for query_scope.py"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.query_scope import scope_query
+
+
+KEYS = ["TCM-1", "TCM-2"]
+NAMES = ["Thrivent", "O'Neil Group"]
+NAMES_IN = "IN ('O''Neil Group', 'Thrivent')"
+ISSUES = "[Jira1].[Jira].[Issues]"
+
+
+def rewrite(sql, tables=None):
+    return scope_query(sql, KEYS, NAMES, tables)[0]
+
+
+class TestScopeQuery:
+    """Test the queryData SQL rewriter."""
+
+    def test_adds_where_clause(self):
+        sql = f"SELECT * FROM {ISSUES}"
+        assert rewrite(sql) == f"{sql} WHERE [ProjectName] {NAMES_IN}"
+
+    def test_ands_with_existing_where_and_keeps_tail(self):
+        sql = f"SELECT Key FROM {ISSUES} i WHERE Status = 'Open' OR Status = 'New' ORDER BY Key LIMIT 5;"
+        assert rewrite(sql) == (
+            f"SELECT Key FROM {ISSUES} i "
+            f"WHERE i.[ProjectName] {NAMES_IN} AND (Status = 'Open' OR Status = 'New') ORDER BY Key LIMIT 5"
+        )
+
+    def test_inserts_before_group_by(self):
+        sql = "select count(*) from Jira.Issues group by Status"
+        assert rewrite(sql) == f"select count(*) from Jira.Issues WHERE [ProjectName] {NAMES_IN} group by Status"
+
+    def test_keywords_inside_literals_are_ignored(self):
+        sql = f"SELECT * FROM {ISSUES} WHERE Summary = 'order by group by'"
+        assert rewrite(sql).endswith("AND (Summary = 'order by group by')")
+
+    def test_keys_source(self):
+        tables = {("jira", "issues"): ("Key", "keys")}
+        assert rewrite(f"SELECT * FROM {ISSUES}", tables) == (
+            f"SELECT * FROM {ISSUES} WHERE [Key] IN ('TCM-1', 'TCM-2')"
+        )
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM [Confluence1].[Confluence].[Pages]",
+        f"SELECT * FROM {ISSUES} a JOIN [Jira1].[Jira].[Projects] b ON a.ProjectKey = b.Key",
+        f"SELECT * FROM {ISSUES}, [Jira1].[Jira].[Projects]",
+        f"SELECT * FROM {ISSUES} WHERE Id IN (SELECT Id FROM [Jira1].[Jira].[Projects])",
+        f"SELECT * FROM {ISSUES} UNION SELECT * FROM [Jira1].[Jira].[Projects]",
+        f"SELECT * FROM {ISSUES}; DELETE FROM {ISSUES}",
+        f"SELECT * FROM {ISSUES} WHERE a = 1 -- note",
+        f"SELECT * FROM {ISSUES} /* all */ WHERE a = 1",
+        f"SELECT * FROM {ISSUES} WITH (NOLOCK)",
+        f"SELECT * FROM {ISSUES} i WITH (NOLOCK) WHERE a = 1",
+        "SELECT * FROM [GitHub1].[GitHub].[Issues]",
+        "SELECT Name FROM [Jira1].[Jira].[Projects]",
+        "SELECT * FROM [Confluence1].[Confluence].[Spaces]",
+        "SELECT * FROM Issues",
+    ])
+    def test_unsupported_queries_unchanged(self, sql):
+        assert scope_query(sql, KEYS, NAMES) == (sql, None, 0)
+
+    def test_no_active_projects_unchanged(self):
+        sql = f"SELECT * FROM {ISSUES}"
+        assert scope_query(sql, [], []) == (sql, None, 0)
+
+    def test_reports_table_and_value_count(self):
+        _, table, count = scope_query(f"SELECT * FROM {ISSUES}", KEYS, NAMES)
+        assert (table, count) == ("jira.issues", 2)
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+"""Tests for shared_snapshot.py and ActiveProjectsCache.attach"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.active_projects_cache import ActiveProjectsCache
+from scripts.prompt_manager import PromptManager
+from scripts.shared_snapshot import SharedSnapshot, publish_snapshot, read_generation
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROJECTS = [
+    {"key": "TCM-1", "name": "Thrivent Financial", "sources": ["tcm"]},
+    {"key": "TCM-2", "name": "Thrivent Mutual Funds", "sources": ["tcm", "csv"]},
+    {"key": "TCM-3", "name": "3M", "sources": ["tcm"]},
+    {"key": "Acme Corp", "name": "Acme Corp", "sources": ["csv"]},
+    {"key": "TCM-5", "name": "Medtronic", "sources": []},
+    {"key": "TCM-6", "name": "medtronic", "sources": ["tcm"]},
+]
+
+QUERIES = ["tcm-2", "acme corp", "3m", "Medtronic", "Thrivent", "Thrivent Financial Group", "Globex", ""]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "active_projects.snap")
+
+
+class TestSharedSnapshot:
+    """Test publishing and attaching."""
+
+    def test_lookups_match_in_memory_cache(self, snapshot_path):
+        publish_snapshot(PROJECTS, snapshot_path)
+        shared = ActiveProjectsCache()
+        assert shared.attach(snapshot_path) == len(PROJECTS)
+
+        local = ActiveProjectsCache()
+        local.load_projects(PROJECTS)
+        assert shared.list_all() == local.list_all()
+        for query in QUERIES:
+            assert shared.is_active(query) == local.is_active(query), query
+        assert shared.get_keys() == local.get_keys()
+        assert shared.get_names() == local.get_names()
+        assert shared.get_sample_names(3) == local.get_sample_names(3)
+        assert shared.get_sample_names(3) == ["Thrivent Financial", "Thrivent Mutual Funds", "3M"]
+        assert shared.get_sample_names(100) == local.get_names()
+
+    def test_keys_and_names_skip_whole_projects(self, snapshot_path, monkeypatch):
+        publish_snapshot(PROJECTS, snapshot_path)
+        cache = ActiveProjectsCache()
+        cache.attach(snapshot_path, check_interval=0.0001)
+        first = cache._snapshot._mapping
+
+        # Only the key/name strings are read, never whole projects - including for the prompt
+        monkeypatch.setattr(type(first), "project", lambda self, number: pytest.fail("decoded a project"))
+        assert cache.get_keys() == [p["key"] for p in PROJECTS]
+        assert cache.get_names()[-1] == "medtronic"
+        assert "TCM-6: medtronic" in PromptManager(cache).get_system_prompt()
+
+        publish_snapshot(PROJECTS[:1], snapshot_path)
+        assert cache.get_keys() == ["TCM-1"]
+
+    def test_new_generations_are_picked_up(self, snapshot_path):
+        assert publish_snapshot(PROJECTS[:2], snapshot_path) == 1
+        cache = ActiveProjectsCache()
+        cache.attach(snapshot_path, check_interval=0.0001)
+        old_mapping = cache._snapshot._mapping
+        assert cache.version() == 1
+
+        assert publish_snapshot(PROJECTS, snapshot_path) == 2
+        assert cache.count() == len(PROJECTS)
+        assert cache.version() == 2
+        assert cache.is_active("TCM-3")["exact_match"]
+        # The previous generation stays readable for anyone still holding it
+        assert old_mapping.count == 2
+
+    def test_missing_file_until_first_publish(self, snapshot_path):
+        cache = ActiveProjectsCache()
+        assert cache.attach(snapshot_path, check_interval=0.0001) == 0
+        assert not cache.is_loaded()
+        assert not cache.is_active("TCM-1")["active"]
+
+        publish_snapshot(PROJECTS, snapshot_path)
+        assert cache.is_loaded()
+        assert cache.is_active("TCM-1")["exact_match"]
+
+    def test_unicode_and_empty(self, snapshot_path):
+        publish_snapshot([{"key": "TCM-9", "name": "Société Générale"}], snapshot_path)
+        snapshot = SharedSnapshot(snapshot_path)
+        assert snapshot.get_by_name("société générale")[0]["key"] == "TCM-9"
+        assert snapshot.get_by_key("TCM-10") is None
+
+        publish_snapshot([], snapshot_path)
+        assert SharedSnapshot(snapshot_path).list_all() == []
+        assert read_generation(snapshot_path) == 2
+
+
+class TestMultiProcess:
+    """Test the refresher and worker processes."""
+
+    def test_refresher_publishes_for_workers(self, snapshot_path, tmp_path):
+        csv_path = tmp_path / "projects.csv"
+        csv_path.write_text("key,name\nTCM-1,Thrivent\nTCM-2,Medtronic\n")
+        env = {
+            **os.environ,
+            "PROJECT_SOURCE_TCM": "false",
+            "PROJECT_SOURCE_CSV": str(csv_path),
+        }
+        subprocess.run(
+            [sys.executable, "-m", "scripts.shared_snapshot", "--path", snapshot_path, "--once"],
+            cwd=PROJECT_ROOT, env=env, check=True, capture_output=True,
+        )
+
+        worker = (
+            "from scripts.active_projects_cache import ActiveProjectsCache\n"
+            "cache = ActiveProjectsCache()\n"
+            f"cache.attach({snapshot_path!r})\n"
+            "print(cache.version(), cache.is_active('medtronic')['matches'][0]['key'])\n"
+        )
+        workers = [
+            subprocess.Popen([sys.executable, "-c", worker], cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+            for _ in range(3)
+        ]
+        assert [w.communicate()[0].strip() for w in workers] == ["1 TCM-2"] * 3
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
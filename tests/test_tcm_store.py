@@ -0,0 +1,118 @@
+"""Tests for tcm_store.py and tcm_tools.py"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.tcm_store import TCMStore
+from scripts import tcm_tools
+
+
+SAMPLE_ISSUES = [
+    {"key": "TCM-1", "summary": "Thrivent Data Platform", "issuetype": "Project", "status": "Active"},
+    {"key": "TCM-2", "summary": "Thrivent", "issuetype": "Client", "status": "Active"},
+    {"key": "TCM-3", "summary": "Jane Doe - Data Engineer", "issuetype": "Candidate", "status": "Placed"},
+    {"key": "TCM-4", "summary": "John Roe - QA Analyst", "issuetype": "Candidate", "status": "Interviewing"},
+    {"key": "TCM-5", "summary": "Medtronic Modernization", "issuetype": "Project", "status": "Closed"},
+    {"key": "TCM-6", "summary": "Quarterly capacity review", "issuetype": "Operations", "status": None},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    dump_path = tmp_path / "tcm_full_dump.json"
+    dump_path.write_text(json.dumps(SAMPLE_ISSUES))
+    s = TCMStore()
+    s.load(str(dump_path))
+    return s
+
+
+class TestTCMStore:
+    """Test the TCMStore class."""
+
+    def test_load(self, store):
+        """Test loading the dump file."""
+        assert store.is_loaded()
+        assert store.count() == len(SAMPLE_ISSUES)
+
+    def test_reload_replaces_data(self, store):
+        """Test that loading again replaces the previous snapshot."""
+        assert store.load_issues(SAMPLE_ISSUES[:2]) == 2
+        assert store.count() == 2
+
+    def test_count_filters_case_insensitive(self, store):
+        """Test counting with issuetype/status filters."""
+        assert store.count(issuetype="candidate") == 2
+        assert store.count(issuetype="Project", status="Active") == 1
+
+    def test_breakdown_by_issuetype(self, store):
+        """Test grouping by issuetype, largest groups first."""
+        groups = store.breakdown("issuetype")
+        assert groups[0]["count"] == 2
+        assert {g["value"]: g["count"] for g in groups}["Operations"] == 1
+
+    def test_breakdown_rejects_unknown_field(self, store):
+        """Test that only indexed fields can be grouped by."""
+        with pytest.raises(ValueError):
+            store.breakdown("summary; DROP TABLE issues")
+
+    def test_get_by_key(self, store):
+        """Test exact key lookup."""
+        assert store.get("tcm-3")["summary"] == "Jane Doe - Data Engineer"
+        assert store.get("TCM-999") is None
+
+    def test_search_text(self, store):
+        """Test full-text search on summary, with prefix matching."""
+        keys = {i["key"] for i in store.search("thriv")}
+        assert keys == {"TCM-1", "TCM-2"}
+
+    def test_search_text_with_filter(self, store):
+        """Test combining text search with an issuetype filter."""
+        results = store.search("data", issuetype="Candidate")
+        assert [i["key"] for i in results] == ["TCM-3"]
+
+    def test_search_punctuation_is_safe(self, store):
+        """Test that FTS syntax characters in the query don't raise."""
+        assert store.search('Jane "Doe -') != []
+
+    def test_unloaded_store_is_empty(self):
+        """Test queries against a store with nothing loaded."""
+        s = TCMStore()
+        assert not s.is_loaded()
+        assert s.count() == 0
+        assert s.search("anything") == []
+
+
+class TestTCMTools:
+    """Test the TCM tool handlers."""
+
+    def test_breakdown_handler(self, store, monkeypatch):
+        monkeypatch.setattr(tcm_tools, "tcm_store", store)
+        result = asyncio.run(tcm_tools.handle_tcm_breakdown({"group_by": "status", "issuetype": "Project"}))
+        text = result["content"][0]["text"]
+        assert "2 total" in text
+        assert "Closed: 1" in text
+
+    def test_search_handler_by_key(self, store, monkeypatch):
+        monkeypatch.setattr(tcm_tools, "tcm_store", store)
+        result = asyncio.run(tcm_tools.handle_search_tcm_issues({"key": "TCM-5"}))
+        assert "Medtronic Modernization" in result["content"][0]["text"]
+
+    def test_search_handler_ignores_bad_limit(self, store, monkeypatch):
+        monkeypatch.setattr(tcm_tools, "tcm_store", store)
+        result = asyncio.run(tcm_tools.handle_search_tcm_issues({"text": "Thrivent", "limit": "ten"}))
+        assert "2 shown" in result["content"][0]["text"]
+
+    def test_handlers_report_missing_snapshot(self, monkeypatch):
+        monkeypatch.setattr(tcm_tools, "tcm_store", TCMStore())
+        result = asyncio.run(tcm_tools.handle_search_tcm_issues({"text": "x"}))
+        assert "No TCM snapshot loaded" in result["content"][0]["text"]
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""Tests for tool_selection.py"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_servers import CDATA_TOOL_NAMES
+from scripts.tool_selection import (
+    CORE_CDATA_TOOLS,
+    ToolSelector,
+    compact_description,
+    compact_schema,
+)
+from scripts.tcm_tools import get_tcm_tool_definitions
+
+
+LONG_DESCRIPTION = "Runs the tool. " + "It has a lot of detail the model rarely needs. " * 20
+
+
+def _cdata_defs():
+    return [
+        {
+            "name": name,
+            "description": LONG_DESCRIPTION,
+            "inputSchema": {
+                "type": "object",
+                "title": f"{name}Arguments",
+                "properties": {
+                    "title": {"type": "string", "description": "A property that happens to be called title. " * 5},
+                    "catalogName": {"type": "string", "examples": ["Jira1"]},
+                },
+            },
+        }
+        for name in CDATA_TOOL_NAMES
+    ]
+
+
+@pytest.fixture
+def selector():
+    return ToolSelector(_cdata_defs(), get_tcm_tool_definitions())
+
+
+class TestToolSelector:
+    """Test which tools are exposed each turn."""
+
+    def test_starts_with_core_and_local_tools(self, selector):
+        names = [t["name"] for t in selector.exposed_defs()]
+        assert set(names) == (CORE_CDATA_TOOLS | {"tcm_breakdown", "search_tcm_issues"})
+        assert "executeProcedure" not in names
+
+    def test_expands_on_procedure_request_and_stays_expanded(self, selector):
+        assert not selector.needs_extended("What active projects do we have?")
+        assert selector.needs_extended("Execute the RefreshCache stored procedure")
+        selector.expand()
+        assert not selector.needs_extended("Run the procedure again")
+        assert {"executeProcedure", "getProcedureParameters"} <= selector.exposed
+
+    def test_token_report_shows_savings(self, selector):
+        report = selector.token_report()
+        assert report["exposed_count"] == 8
+        assert report["total_count"] == 11
+        assert 0 < report["exposed_tokens"] < report["full_tokens"]
+        assert report["saved_tokens"] == report["full_tokens"] - report["exposed_tokens"]
+
+        selector.expand()
+        # Compaction alone still saves tokens once everything is exposed
+        assert selector.token_report()["saved_tokens"] > 0
+
+    def test_descriptions_are_not_cut_by_default(self, selector):
+        collapsed = " ".join(LONG_DESCRIPTION.split())
+        query_data = next(t for t in selector.exposed_defs() if t["name"] == "queryData")
+        assert query_data["description"] == collapsed
+
+        limited = ToolSelector(_cdata_defs(), [], max_description_chars=100)
+        assert len(limited.exposed_defs()[0]["description"]) <= 100
+
+
+class TestCompaction:
+    """Test description and schema compaction."""
+
+    def test_description_keeps_whole_sentences(self):
+        short = compact_description(LONG_DESCRIPTION, 100)
+        assert len(short) <= 100
+        assert short.endswith(".")
+        assert compact_description("  Short   text. ") == "Short text."
+        assert compact_description(LONG_DESCRIPTION) == " ".join(LONG_DESCRIPTION.split())
+
+    def test_schema_drops_keywords_but_keeps_property_names(self):
+        schema = compact_schema(_cdata_defs()[0]["inputSchema"], property_max_chars=50)
+        assert "title" not in schema
+        assert set(schema["properties"]) == {"title", "catalogName"}
+        assert "examples" not in schema["properties"]["catalogName"]
+        assert len(schema["properties"]["title"]["description"]) <= 50
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
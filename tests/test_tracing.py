@@ -0,0 +1,74 @@
+"""Tests for tracing.py"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.tracing import Tracer
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)["traceEvents"]
+
+
+class TestTracer:
+    """Test the Tracer class."""
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("work", cat="test"):
+            pass
+        tracer.instant("tick", cat="test")
+        assert tracer.flush("turn-1") is None
+
+    def test_span_written_as_complete_event(self, tmp_path):
+        tracer = Tracer()
+        tracer.configure(str(tmp_path))
+        with tracer.span("cdata http tools/call", cat="http", tool="queryData"):
+            pass
+
+        path = tracer.flush("turn-1")
+        assert path.endswith("-turn-1.json")
+        spans = [e for e in _load(path) if e["ph"] == "X"]
+        assert spans[0]["name"] == "cdata http tools/call"
+        assert spans[0]["args"] == {"tool": "queryData"}
+        assert spans[0]["dur"] >= 0
+
+        # Buffer is cleared after a flush
+        assert tracer.flush("turn-2") is None
+
+    def test_span_records_error(self, tmp_path):
+        tracer = Tracer()
+        tracer.configure(str(tmp_path))
+        with pytest.raises(ValueError):
+            with tracer.span("parse", cat="http"):
+                raise ValueError("bad")
+        events = _load(tracer.flush("turn-1"))
+        assert events[-1]["args"]["error"] == "ValueError: bad"
+
+    def test_concurrent_tasks_get_separate_tracks(self, tmp_path):
+        tracer = Tracer()
+        tracer.configure(str(tmp_path))
+
+        async def tool_call(name):
+            with tracer.span(name, cat="tool"):
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(tool_call("a"), tool_call("b"))
+
+        asyncio.run(run())
+        events = _load(tracer.flush("turn-1"))
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert spans["a"]["tid"] != spans["b"]["tid"]
+        assert sum(1 for e in events if e["ph"] == "M") == 2
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""Tests for transport.py and the cassette load generator"""
+
+import asyncio
+import gzip
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_servers import FakeCDataServer
+from benchmarks.load_generator import conversation_script, run_load
+from scripts.transport import (
+    CassetteMiss,
+    LiveTransport,
+    RecordingTransport,
+    ReplayTransport,
+    configure_transport_from_env,
+    get_default_transport,
+    set_default_transport,
+)
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    """Record a short MCP session against the fake CData server."""
+    from agent_chatbot import MCPClient
+
+    path = str(tmp_path / "session.jsonl.gz")
+    with FakeCDataServer(payload_bytes=512, latency=0.01) as cdata:
+        client = MCPClient(cdata.url, "user@example.com", "secret-token", RecordingTransport(LiveTransport(), path))
+        client.list_tools()
+        client.call_tool("getCatalogs", {})
+        client.call_tool("queryData", {"query": "SELECT * FROM Spaces"})
+        url = client.server_url
+    return path, url
+
+
+@pytest.fixture(autouse=True)
+def reset_default_transport():
+    yield
+    set_default_transport(None)
+
+
+class TestRecordReplay:
+    """Test recording and replaying exchanges."""
+
+    def test_cassette_has_no_credentials(self, cassette):
+        path, _ = cassette
+        with gzip.open(path, "rt") as f:
+            raw = f.read()
+        assert raw.count("\n") == 3
+        assert "secret-token" not in raw
+        assert "Authorization" not in raw
+
+    def test_replay_matches_recorded_responses(self, cassette):
+        from agent_chatbot import MCPClient
+
+        path, url = cassette
+        # The fake server is gone - every response must come from the cassette
+        client = MCPClient(url, "user@example.com", "secret-token", ReplayTransport(path, time_scale=0))
+        assert len(client.list_tools()) == 9
+        result = client.call_tool("queryData", {"query": "SELECT * FROM Spaces"})
+        assert "SELECT * FROM Spaces" in result["content"][0]["text"]
+
+    def test_replay_miss_raises(self, cassette):
+        from agent_chatbot import MCPClient
+
+        path, url = cassette
+        client = MCPClient(url, transport=ReplayTransport(path, time_scale=0))
+        with pytest.raises(CassetteMiss):
+            client.call_tool("queryData", {"query": "SELECT 1"})
+
+    def test_replay_timing_is_scaled(self, cassette):
+        path, url = cassette
+        transport = ReplayTransport(path, time_scale=0)
+        recorded = transport.entries[1]
+        assert recorded["elapsed"] >= 0.01
+
+        import time
+        start = time.perf_counter()
+        ReplayTransport(path, time_scale=2.0).post(url, json=recorded["request"])
+        assert time.perf_counter() - start >= 2 * recorded["elapsed"]
+
+    def test_default_transport_is_live(self):
+        assert isinstance(get_default_transport(), LiveTransport)
+
+    def test_live_sessions_are_per_thread(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        transport = LiveTransport()
+        assert transport._get_session() is transport._get_session()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(transport._get_session).result()
+        assert other is not transport._get_session()
+
+    def test_unknown_mode_is_rejected(self, monkeypatch):
+        monkeypatch.setenv("TRANSPORT_MODE", "bogus")
+        with pytest.raises(ValueError, match="Unknown TRANSPORT_MODE"):
+            configure_transport_from_env()
+
+
+class TestLoadGenerator:
+    """Test replaying concurrent conversations from a cassette."""
+
+    def test_conversation_script(self, cassette):
+        path, url = cassette
+        server_url, calls = conversation_script(path)
+        assert server_url == url
+        assert [name for name, _ in calls] == ["getCatalogs", "queryData"]
+
+    def test_run_load(self, cassette):
+        path, _ = cassette
+        report = asyncio.run(run_load(path, conversations=8, concurrency=4, time_scale=0))
+        assert report["errors"] == 0
+        assert report["calls_per_conversation"] == 3
+        assert report["call_latency"]["count"] == 24
+
+
+if __name__ == "__main__":
+    # Run with pytest or directly
+    pytest.main([__file__, "-v"])